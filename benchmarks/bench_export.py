@@ -0,0 +1,162 @@
+"""Benchmark de vazão da exportação.
+
+Exporta ``--num`` prompts sintéticos (gerados sob demanda, então a lista
+nunca existe em memória nos modos em streaming) e compara com as versões
+anteriores: JSON montado inteiro em memória com ``indent=2`` e JSONL com
+``flush`` a cada linha.
+
+Uso:
+    python -m benchmarks.bench_export --num 1000000
+"""
+
+import argparse
+import json
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Iterator
+
+from models.category import Category
+from modular_prompt_generator import GeneratedPrompt
+from services.text_processor import QualityEvaluator
+from utils import export_utils
+from utils.export_utils import JsonArraySink, JsonlSink, ParquetSink, PromptExporter
+
+CONTENT = (
+    "Elabore o comunicado para Maria Silva, CPF 123.456.789-09, matrícula 4521, "
+    "referente ao período de 10/10/2024, com valor de R$ 1.250,00 e próximos passos."
+)
+
+
+def synthetic_prompts(num: int) -> Iterator[GeneratedPrompt]:
+    category = Category("financeiro", "Análises financeiras", []).to_ref()
+    for i in range(num):
+        yield GeneratedPrompt(
+            f"{CONTENT} ({i})",
+            category,
+            None,
+            {"word_count": 27, "has_names": True, "has_cpf": True},
+            5,
+            6,
+        )
+
+
+def legacy_json(num: int, output_file: Path) -> None:
+    prompts = list(synthetic_prompts(num))
+    data = {
+        "export_date": datetime.now().isoformat(),
+        "total_prompts": len(prompts),
+        "prompts": [prompt.to_dict() for prompt in prompts],
+    }
+    with open(output_file, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def legacy_jsonl(num: int, output_file: Path) -> None:
+    with open(output_file, "w", encoding="utf-8") as f:
+        for prompt_id, prompt in enumerate(synthetic_prompts(num), start=1):
+            record = PromptExporter.to_jsonl_record(prompt, prompt_id)
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+
+
+def streaming(sink_class, **kwargs) -> Callable[[int, Path], None]:
+    def run(num: int, output_file: Path) -> None:
+        with sink_class(output_file, **kwargs) as sink:
+            for prompt in synthetic_prompts(num):
+                sink.write(prompt)
+
+    return run
+
+
+def measure(run: Callable[[int, Path], None], num: int, output_file: Path):
+    start = time.perf_counter()
+    run(num, output_file)
+    return time.perf_counter() - start, output_file.stat().st_size
+
+
+def peak_memory(run: Callable[[int, Path], None], num: int, output_file: Path):
+    # Medido à parte: o tracemalloc deixa a exportação várias vezes mais lenta
+    tracemalloc.start()
+    run(num, output_file)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da exportação")
+    parser.add_argument("--num", type=int, default=1_000_000)
+    parser.add_argument(
+        "--skip-legacy", action="store_true", help="Não mede as versões anteriores"
+    )
+    parser.add_argument(
+        "--memory",
+        type=int,
+        default=100_000,
+        help="Prompts usados para medir o pico de memória (0 desativa)",
+    )
+    args = parser.parse_args()
+
+    cases = []
+    if not args.skip_legacy:
+        cases += [
+            ("JSON em memória (anterior)", "json", legacy_json),
+            ("JSONL flush por linha (anterior)", "jsonl", legacy_jsonl),
+        ]
+    cases += [
+        ("JSON streaming", "json", streaming(JsonArraySink)),
+        ("JSONL streaming", "jsonl", streaming(JsonlSink, flush_each=False)),
+        (
+            "JSONL streaming + gzip",
+            "jsonl.gz",
+            streaming(JsonlSink, compression="gzip", flush_each=False),
+        ),
+    ]
+    try:
+        import zstandard  # noqa: F401
+
+        cases.append(
+            (
+                "JSONL streaming + zstd",
+                "jsonl.zst",
+                streaming(JsonlSink, compression="zstd", flush_each=False),
+            )
+        )
+    except ImportError:
+        print("⚠️  zstandard não instalado, pulando zstd")
+    try:
+        import pyarrow  # noqa: F401
+
+        metric_names = QualityEvaluator().boolean_metric_names()
+        cases.append(
+            (
+                "Parquet",
+                "parquet",
+                streaming(ParquetSink, metric_names=metric_names),
+            )
+        )
+    except ImportError:
+        print("⚠️  pyarrow não instalado, pulando Parquet")
+
+    encoder = "orjson" if export_utils.orjson is not None else "json"
+    print(f"Exportando {args.num:,} prompts (codificador: {encoder}):")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name, suffix, run in cases:
+            output_file = Path(tmp_dir) / f"export.{suffix}"
+            elapsed, size = measure(run, args.num, output_file)
+            line = (
+                f"- {name}: {elapsed:.2f}s ({args.num / elapsed:,.0f} prompts/s), "
+                f"arquivo {size / 2**20:,.1f} MiB"
+            )
+            if args.memory:
+                peak = peak_memory(run, args.memory, output_file)
+                line += f", pico {peak / 2**20:,.1f} MiB p/ {args.memory:,}"
+            print(line)
+            output_file.unlink()
+
+
+if __name__ == "__main__":
+    main()
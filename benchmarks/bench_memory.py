@@ -0,0 +1,129 @@
+"""Benchmark de memória dos modelos.
+
+Compara, por objeto, os modelos com ``__slots__`` (strings internadas e
+metadados vazios compartilhados) com as versões anteriores baseadas em
+``__dict__``, e um ``GeneratedPrompt`` completo com o compacto.
+
+Uso:
+    python -m benchmarks.bench_memory
+"""
+
+import json
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List
+
+from models.category import Category, Example
+from modular_prompt_generator import GeneratedPrompt
+
+NUM_OBJECTS = 100_000
+SUBCATEGORIAS = ["geral", "advertencia", "suspensao_curta", "auditoria"]
+COMPLEXIDADES = ["baixo", "medio", "alto"]
+
+
+@dataclass
+class LegacyExample:
+    prompt: str
+    subcategoria: str = "geral"
+    complexidade: str = "medio"
+    metadata: Dict[str, Any] = None
+
+    def __post_init__(self):
+        if self.metadata is None:
+            self.metadata = {}
+
+
+class LegacyGeneratedPrompt:
+    def __init__(self, content, category, profiles, metrics, score, max_score):
+        self.content = content
+        self.category = category
+        self.profiles = profiles
+        self.metrics = metrics
+        self.quality_score = score
+        self.max_quality_score = max_score
+        self.seed = None
+        self.job_index = None
+        self.prompt_tokens = None
+
+
+def measure(build: Callable[[], List]) -> float:
+    """Bytes retidos por objeto criado por ``build``"""
+    tracemalloc.start()
+    objects = build()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return retained / len(objects)
+
+
+def example_records() -> str:
+    # Exemplos como saem do JSON: cada string é um objeto novo
+    return json.dumps(
+        [
+            {
+                "prompt": f"Exemplo {i}",
+                "subcategoria": SUBCATEGORIAS[i % len(SUBCATEGORIAS)],
+                "nivel_complexidade": COMPLEXIDADES[i % len(COMPLEXIDADES)],
+                "metadata": {},
+            }
+            for i in range(NUM_OBJECTS)
+        ]
+    )
+
+
+def build_examples(example_class, raw: str) -> Callable[[], List]:
+    def build():
+        return [
+            example_class(
+                prompt=record["prompt"],
+                subcategoria=record["subcategoria"],
+                complexidade=record["nivel_complexidade"],
+                metadata=record["metadata"],
+            )
+            for record in json.loads(raw)
+        ]
+
+    return build
+
+
+def build_prompts(prompt_class, compact: bool = False) -> Callable[[], List]:
+    category = Category("financeiro", "Análises financeiras", [])
+    profile_json = json.dumps(
+        {"name": "Maria Silva", "cpf": "123.456.789-09", "job": "Analista"}
+    )
+
+    def build():
+        return [
+            prompt_class(
+                "Texto do prompt",
+                category.to_ref() if compact else category,
+                None if compact else [json.loads(profile_json) for _ in range(3)],
+                {"word_count": 250},
+                5,
+                6,
+            )
+            for _ in range(NUM_OBJECTS)
+        ]
+
+    return build
+
+
+def main():
+    raw = example_records()
+    rows = [
+        ("Example (dataclass)", measure(build_examples(LegacyExample, raw))),
+        ("Example (slots)", measure(build_examples(Example, raw))),
+        ("GeneratedPrompt (dict)", measure(build_prompts(LegacyGeneratedPrompt))),
+        ("GeneratedPrompt (slots)", measure(build_prompts(GeneratedPrompt))),
+        (
+            "GeneratedPrompt (compacto)",
+            measure(build_prompts(GeneratedPrompt, compact=True)),
+        ),
+    ]
+
+    print(f"Memória retida por objeto ({NUM_OBJECTS:,} objetos):")
+    for name, size in rows:
+        print(f"- {name}: {size:,.0f} bytes")
+
+
+if __name__ == "__main__":
+    main()
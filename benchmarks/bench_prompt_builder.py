@@ -0,0 +1,53 @@
+"""Microbenchmark da construção de prompts.
+
+Compara a montagem com os trechos estáticos em cache com a renderização
+completa do template a cada chamada (comportamento anterior).
+
+Uso:
+    python -m benchmarks.bench_prompt_builder
+"""
+
+import random
+import timeit
+
+from config.settings import AppConfig
+from services.category_loader import CategoryLoader
+from services.prompt_builder import PromptBuilder
+
+ITERATIONS = 20_000
+
+
+def main():
+    categories = list(
+        CategoryLoader(AppConfig().examples_dir).load_all_categories().values()
+    )
+    if not categories:
+        print("❌ Nenhuma categoria disponível")
+        return
+
+    profiles = [{"name": "Maria Silva", "cpf": "123.456.789-09", "job": "Analista"}] * 3
+    builder = PromptBuilder()
+    builder.prepare(categories)
+    rng = random.Random(0)
+
+    def cached():
+        category = rng.choice(categories)
+        builder.build_specialized_prompt(category, profiles, 4, rng=rng)
+
+    def uncached():
+        category = rng.choice(categories)
+        builder._templates.clear()
+        builder.build_specialized_prompt(category, profiles, 4, rng=rng)
+
+    print(f"\n⏱️  {ITERATIONS} prompts por variante")
+    results = {}
+    for name, func in [("sem cache", uncached), ("com cache", cached)]:
+        elapsed = min(timeit.repeat(func, number=ITERATIONS, repeat=3))
+        results[name] = elapsed
+        print(f"- {name}: {elapsed / ITERATIONS * 1e6:.1f} µs/prompt")
+
+    print(f"- Ganho: {results['sem cache'] / results['com cache']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
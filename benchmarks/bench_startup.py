@@ -0,0 +1,95 @@
+"""Benchmark de inicialização a frio.
+
+Mede, em processos novos, o tempo de importar ``modular_prompt_generator``,
+construir o gerador e concluir o primeiro ``generate_prompt`` contra um stub
+local do Ollama (sem GPU), e lista os módulos mais caros segundo
+``python -X importtime``.
+
+Uso:
+    python -m benchmarks.bench_startup [--runs 5]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+from utils.ollama_stub import start_stub_server
+
+ROOT = Path(__file__).resolve().parent.parent
+
+CHILD_SCRIPT = """
+import json, time
+start = time.perf_counter()
+from config.settings import AppConfig
+from modular_prompt_generator import ModularPromptGenerator
+imported = time.perf_counter()
+generator = ModularPromptGenerator(AppConfig())
+constructed = time.perf_counter()
+generator.generate_prompt()
+generated = time.perf_counter()
+generator.close()
+print("RESULT " + json.dumps({
+    "import": imported - start,
+    "construct": constructed - imported,
+    "first_prompt": generated - constructed,
+    "total": generated - start,
+}))
+"""
+
+
+def run_child(host: str, importtime: bool = False) -> subprocess.CompletedProcess:
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    return subprocess.run(
+        command + ["-c", CHILD_SCRIPT],
+        cwd=ROOT,
+        env={**os.environ, "OLLAMA_HOST": host},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def parse_result(stdout: str) -> dict:
+    line = next(line for line in stdout.splitlines() if line.startswith("RESULT "))
+    return json.loads(line[len("RESULT ") :])
+
+
+def top_imports(stderr: str, count: int = 10) -> list:
+    """Módulos de nível superior com maior tempo acumulado de importação"""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if cumulative.strip().isdigit() and not name.startswith("  "):
+            modules.append((int(cumulative), name.strip()))
+    return sorted(modules, reverse=True)[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de inicialização")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    server = start_stub_server()
+    results = [parse_result(run_child(server.host).stdout) for _ in range(args.runs)]
+
+    print(f"Inicialização a frio (mediana de {args.runs} execuções):")
+    for phase in ("import", "construct", "first_prompt", "total"):
+        median = statistics.median(result[phase] for result in results)
+        print(f"- {phase}: {median * 1000:.1f} ms")
+
+    print("\nImportações mais caras (-X importtime, acumulado):")
+    for cumulative, name in top_imports(run_child(server.host, importtime=True).stderr):
+        print(f"- {name}: {cumulative / 1000:.1f} ms")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
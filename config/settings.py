@@ -1,5 +1,6 @@
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Optional
 
 
 @dataclass
@@ -11,6 +12,21 @@ class LLMConfig:
     repeat_penalty: float = 1.12
     num_predict: int = 650
     stop_tokens: list = None
+    # Lê a resposta em streaming e cancela a geração ao surgir um marcador de
+    # sufixo ou ao passar do máximo de palavras da categoria
+    stream: bool = False
+    # Tempo que o Ollama mantém o modelo (e seu cache de prefixo) carregado
+    keep_alive: Optional[str] = "30m"
+    # Vários hosts Ollama (ex.: ["http://gpu1:11434", "http://gpu2:11434"]);
+    # None usa o host padrão do cliente ollama
+    hosts: Optional[list] = None
+    health_check_interval: float = 10.0
+    host_failure_threshold: int = 3
+    # Cache persistente de respostas (ver services/response_cache.py)
+    cache_enabled: bool = False
+    cache_path: Path = Path(".cache/llm_responses.sqlite")
+    cache_max_entries: Optional[int] = 100_000
+    cache_max_age_seconds: Optional[float] = None
 
     def __post_init__(self):
         if self.stop_tokens is None:
@@ -26,10 +42,40 @@ class LLMConfig:
 @dataclass
 class AppConfig:
     examples_dir: Path = Path("examples")
+    # Índice das categorias (nome, exemplos, mtime); None refaz a cada execução
+    category_index_path: Optional[Path] = Path(".cache/category_index.json")
+    # Corpus binário gerado por "python -m utils.compile_corpus"; arquivos
+    # alterados depois da compilação são lidos do JSON
+    category_corpus_path: Optional[Path] = Path(".cache/categories.corpus")
+    # Intervalo (s) para verificar mudanças em examples_dir; None desativa.
+    # ModularPromptGenerator.reload_categories recarrega sob demanda
+    category_reload_interval: Optional[float] = None
     default_profiles: int = 3
     default_examples: int = 4
     min_word_count: int = 200
     max_word_count: int = 500
+    max_in_flight: int = 16
+    # Ajusta as requisições simultâneas entre min_in_flight e max_in_flight
+    # conforme latência e erros observados (AIMD)
+    adaptive_concurrency: bool = False
+    min_in_flight: int = 1
+    pii_backend: str = "local"  # "local" (sem rede) ou "fordev"
+    # Atributos dos exemplos usados para estratificar o sorteio, ex.:
+    # ("subcategoria", "complexidade"); vazio sorteia sem estratificação
+    example_stratify_by: tuple = ()
+    # Perfis em linhas "campo: valor" só com os campos usados nos prompts
+    compact_profiles: bool = False
+    # Limite aproximado de tokens do prompt; exemplos são escolhidos/cortados
+    # para caber. None desativa o limite
+    prompt_token_budget: Optional[int] = None
+    # "classic" ou "prefix_stable" (prefixo idêntico por categoria, reaproveita
+    # o cache KV do servidor)
+    prompt_layout: str = "classic"
+    # Resultados guardam só nome/descrição da categoria e descartam os perfis
+    compact_results: bool = False
+    use_profile_pool: bool = True
+    profile_pool_low_watermark: int = 16
+    profile_pool_high_watermark: int = 64
     llm_config: LLMConfig = None
 
     def __post_init__(self):
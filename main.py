@@ -1,31 +1,112 @@
+import argparse
+import random
 from pathlib import Path
+from config.settings import AppConfig, LLMConfig
 from modular_prompt_generator import ModularPromptGenerator
-from utils.export_utils import PromptExporter
+from utils.export_utils import JsonlSink, resolve_compression
+from utils.run_journal import RunJournal
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Geração de prompts em lote")
+    parser.add_argument("--num-prompts", type=int, default=100)
+    parser.add_argument(
+        "--output", type=Path, default=Path("outputs/prompts_export.jsonl")
+    )
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Reutiliza respostas do LLM já obtidas para o mesmo prompt e opções",
+    )
+    parser.add_argument(
+        "--hosts",
+        default=None,
+        help="Hosts Ollama separados por vírgula (ex.: http://gpu1:11434,http://gpu2:11434)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Retoma a execução registrada no diário ao lado da exportação",
+    )
+    return parser.parse_args()
 
 
 def main():
     """Exemplo de funcionalidades de exportação"""
+    args = parse_args()
+
     print("\n" + "=" * 60)
     print("EXEMPLO 4: EXPORTAÇÃO DE DADOS")
     print("=" * 60)
 
-    generator = ModularPromptGenerator()
-
-    # Gerar alguns prompts
-    prompts = generator.batch_generate(num_prompts=100)
-
-    if not prompts:
-        print("❌ Nenhum prompt para exportar")
+    # O diário trunca e retoma a exportação linha a linha, o que exige um
+    # arquivo sem compressão
+    if resolve_compression(args.output, "auto") is not None:
+        print(
+            f"❌ {args.output}: a geração em lote grava JSONL sem compressão; "
+            "use --output com extensão .jsonl"
+        )
         return
 
-    # Exportar para JSON
-    json_file = Path("outputs/prompts_export.jsonl")
+    hosts = args.hosts.split(",") if args.hosts else None
+    config = AppConfig(llm_config=LLMConfig(cache_enabled=args.cache, hosts=hosts))
+    generator = ModularPromptGenerator(config)
+
+    json_file = args.output
     json_file.parent.mkdir(exist_ok=True)
+    journal_path = RunJournal.path_for(json_file)
 
-    success_jsonl = PromptExporter.export_to_jsonl(prompts, json_file)
+    resuming = args.resume and journal_path.exists()
+    if resuming:
+        journal = RunJournal.load(journal_path)
+        removed = journal.truncate_export(json_file)
+        if removed:
+            print(f"⚠️  {removed} linha(s) não registradas removidas de {json_file}")
+        jobs = journal.pending_jobs()
+        print(
+            f"🔁 Retomando execução: {len(journal.completed)} concluídos, "
+            f"{len(jobs)} pendentes"
+        )
+    else:
+        if args.resume:
+            print(f"⚠️  Diário {journal_path} não encontrado, iniciando nova execução")
+        run_seed = args.seed if args.seed is not None else random.randrange(2**31)
+        jobs = generator.plan_jobs(args.num_prompts, seed=run_seed)
+        journal = RunJournal.create(journal_path, jobs, run_seed)
+
+    # Cada prompt é gravado assim que fica pronto e registrado no diário
+    with journal, JsonlSink(json_file, append=resuming) as sink:
+        for prompt in generator.iter_generate(jobs=jobs):
+            prompt_id = sink.write(prompt)
+            journal.mark_done(prompt.job_index, prompt_id)
+
+    backend_pool = generator.llm_service.backend_pool
+    if backend_pool is not None:
+        print("\n🖥️  Hosts Ollama:")
+        for host, stats in backend_pool.stats().items():
+            print(
+                f"- {host}: {stats['completed']} ok, {stats['errors']} erros, "
+                f"{stats['throughput']:.2f} req/s, latência média "
+                f"{stats['avg_latency']:.2f}s"
+                f"{'' if stats['healthy'] else ' (fora do pool)'}"
+            )
+
+    cache = generator.llm_service.cache
+    if cache is not None:
+        stats = cache.stats()
+        print(
+            f"💾 Cache de respostas: {stats['hits']} acertos, {stats['misses']} faltas "
+            f"({stats['entries']} entradas)"
+        )
+
+    generator.close()
+
+    if not sink.count:
+        print("❌ Nenhum prompt para exportar")
+        return
 
-    if success_jsonl:
-        print("✅ Dados exportados com sucesso para JSON e CSV!")
+    print(f"✅ {sink.count} prompts exportados para {json_file} (formato JSONL)")
 
 
 if __name__ == "__main__":
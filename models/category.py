@@ -1,39 +1,146 @@
-from dataclasses import dataclass
-from typing import List, Dict, Any
+import random
+import sys
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 
-@dataclass
+class _EmptyMetadata(Mapping[str, Any]):
+    """Mapeamento vazio e imutável; volta a ser o mesmo objeto ao ser lido do pickle"""
+
+    __slots__ = ()
+
+    def __getitem__(self, key: str) -> Any:
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(())
+
+    def __len__(self) -> int:
+        return 0
+
+    def __repr__(self) -> str:
+        return "{}"
+
+    def __reduce__(self) -> str:
+        return "EMPTY_METADATA"
+
+
+# Metadados vazios compartilhados (somente leitura) por todos os exemplos
+EMPTY_METADATA: Mapping[str, Any] = _EmptyMetadata()
+
+
+@dataclass(slots=True)
 class Example:
 
     prompt: str
     subcategoria: str = "geral"
     complexidade: str = "medio"
-    metadata: Dict[str, Any] = None
+    metadata: Mapping[str, Any] = None
 
     def __post_init__(self):
-        if self.metadata is None:
-            self.metadata = {}
+        # Poucos valores distintos repetidos em milhões de exemplos
+        self.subcategoria = sys.intern(self.subcategoria)
+        self.complexidade = sys.intern(self.complexidade)
+        if not self.metadata:
+            self.metadata = EMPTY_METADATA
 
 
-@dataclass
+class CategoryRef(NamedTuple):
+    """Referência leve a uma categoria, guardada em resultados compactos"""
+
+    nome: str
+    descricao: str
+
+
+@dataclass(slots=True)
 class Category:
     nome: str
     descricao: str
     exemplos: List[Example]
     diretrizes_especificas: List[str] = None
-    metricas_qualidade: Dict[str, str] = None
+    metricas_qualidade: Dict[str, Any] = None
+    # Campos de perfil usados na serialização compacta (vazio = padrão)
+    campos_perfil: List[str] = None
+    # Índices dos exemplos agrupados por estrato, calculados sob demanda
+    _strata_cache: Dict[Tuple, List[List[int]]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    # CategoryRef único, compartilhado pelos resultados compactos
+    _ref: Optional[CategoryRef] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def __post_init__(self):
         if self.diretrizes_especificas is None:
             self.diretrizes_especificas = []
         if self.metricas_qualidade is None:
             self.metricas_qualidade = {}
+        if self.campos_perfil is None:
+            self.campos_perfil = []
 
-    def get_random_examples(self, max_examples: int = 3) -> List[Example]:
-        import random
+    def to_ref(self) -> CategoryRef:
+        """Referência compartilhada por todos os resultados da categoria"""
+        if self._ref is None:
+            self._ref = CategoryRef(self.nome, self.descricao)
+        return self._ref
 
+    def get_random_examples(
+        self,
+        max_examples: int = 3,
+        rng: Optional[random.Random] = None,
+        stratify_by: Sequence[str] = (),
+    ) -> List[Example]:
+        """Sorteia até ``max_examples`` exemplos sem alterar a categoria.
+
+        ``rng`` permite sorteios reproduzíveis e independentes entre threads.
+        Com ``stratify_by`` (ex.: ``("subcategoria", "complexidade")``) os
+        exemplos são distribuídos entre os estratos antes de repetir algum.
+        """
         if not self.exemplos:
             return []
 
-        random.shuffle(self.exemplos)
-        return self.exemplos[:max_examples]
+        rng = rng or random
+        count = min(max_examples, len(self.exemplos))
+        if not stratify_by:
+            return rng.sample(self.exemplos, count)
+
+        strata = self._get_strata(tuple(stratify_by))
+        per_stratum = [0] * len(strata)
+        remaining = count
+        order = rng.sample(range(len(strata)), len(strata))
+        while remaining:
+            for i in order:
+                if remaining and per_stratum[i] < len(strata[i]):
+                    per_stratum[i] += 1
+                    remaining -= 1
+
+        selected = [
+            self.exemplos[index]
+            for stratum, stratum_count in zip(strata, per_stratum)
+            if stratum_count
+            for index in rng.sample(stratum, stratum_count)
+        ]
+        rng.shuffle(selected)
+        return selected
+
+    def _get_strata(self, stratify_by: Tuple[str, ...]) -> List[List[int]]:
+        key = (stratify_by, len(self.exemplos))
+        strata = self._strata_cache.get(key)
+        if strata is None:
+            groups: Dict[Tuple, List[int]] = {}
+            for index, example in enumerate(self.exemplos):
+                stratum = tuple(getattr(example, attr) for attr in stratify_by)
+                groups.setdefault(stratum, []).append(index)
+            strata = list(groups.values())
+            self._strata_cache[key] = strata
+        return strata
@@ -0,0 +1,40 @@
+import hashlib
+import random
+from dataclasses import dataclass
+from typing import Iterator, Optional, Sequence
+
+
+@dataclass(frozen=True)
+class PlannedJob:
+    """Uma geração planejada dentro de um lote"""
+
+    index: int
+    category: str
+    seed: Optional[int] = None
+
+
+def derive_seed(run_seed: int, index: int) -> int:
+    """Deriva a seed de um job a partir da seed da execução e do índice do job"""
+    digest = hashlib.blake2b(f"{run_seed}:{index}".encode(), digest_size=4).digest()
+    return int.from_bytes(digest, "big") & 0x7FFFFFFF
+
+
+def iter_jobs(
+    categories: Sequence[str], num_prompts: int, seed: Optional[int] = None
+) -> Iterator[PlannedJob]:
+    """Sorteia a categoria de cada job; com ``seed`` o plano é reproduzível.
+
+    As categorias são ordenadas antes do sorteio, então o plano não depende da
+    ordem em que os arquivos de exemplo foram listados.
+    """
+    categories = sorted(categories)
+    if not categories:
+        return
+
+    rng = random.Random(seed) if seed is not None else random
+    for index in range(num_prompts):
+        yield PlannedJob(
+            index=index,
+            category=rng.choice(categories),
+            seed=derive_seed(seed, index) if seed is not None else None,
+        )
@@ -1,30 +1,53 @@
 import random
-from typing import List, Optional, Dict, Any
+import threading
+import time
+from typing import Iterator, List, Mapping, Optional, Dict, Any, Tuple, Union
 
-import concurrent
-
-from tqdm import tqdm
+import concurrent.futures
 
 from config.settings import AppConfig
 from services.category_loader import CategoryLoader
 from services.prompt_builder import PromptBuilder
 from services.llm_service import LLMService
 from services.text_processor import TextProcessor, QualityEvaluator
-from models.category import Category
+from services.profile_pool import ProfilePool
+from services.concurrency import AIMDController
+from models.category import Category, CategoryRef
+from models.job import PlannedJob, iter_jobs
 from pii_generator import PIIGenerator
+from utils.token_counter import estimate_tokens
 
 
 class GeneratedPrompt:
-    """Representa um prompt gerado com suas métricas"""
+    """Representa um prompt gerado com suas métricas.
+
+    Em modo compacto (``AppConfig.compact_results``) ``category`` é apenas um
+    ``CategoryRef`` (nome e descrição) e ``profiles`` é None.
+    """
+
+    __slots__ = (
+        "content",
+        "category",
+        "profiles",
+        "metrics",
+        "quality_score",
+        "max_quality_score",
+        "seed",
+        "job_index",
+        "prompt_tokens",
+    )
 
     def __init__(
         self,
         content: str,
-        category: Category,
-        profiles: List,
+        category: Union[Category, CategoryRef],
+        profiles: Optional[List],
         metrics: Dict[str, Any],
         quality_score: int,
         max_quality_score: int,
+        seed: Optional[int] = None,
+        job_index: Optional[int] = None,
+        prompt_tokens: Optional[int] = None,
     ):
         self.content = content
         self.category = category
@@ -32,6 +55,9 @@ class GeneratedPrompt:
         self.metrics = metrics
         self.quality_score = quality_score
         self.max_quality_score = max_quality_score
+        self.seed = seed
+        self.job_index = job_index
+        self.prompt_tokens = prompt_tokens
 
     @property
     def quality_percentage(self) -> float:
@@ -77,6 +103,8 @@ class GeneratedPrompt:
             for metric, value in category_metrics.items():
                 print(f"  • {metric}: {'✅' if value else '❌'}")
 
+        if self.prompt_tokens is not None:
+            print(f"- Tokens do prompt (estimativa): {self.prompt_tokens}")
         print(
             f"- Score final: {self.quality_score}/{self.max_quality_score} ({self.quality_percentage:.1f}%)"
         )
@@ -92,6 +120,7 @@ class GeneratedPrompt:
             "quality_score": self.quality_score,
             "max_quality_score": self.max_quality_score,
             "quality_percentage": self.quality_percentage,
+            "prompt_tokens": self.prompt_tokens,
         }
 
 
@@ -101,24 +130,151 @@ class ModularPromptGenerator:
     def __init__(self, config: Optional[AppConfig] = None):
         self.config = config or AppConfig()
         self._initialize_services()
-        self.categories: Dict[str, Category] = {}
+        self.categories: Mapping[str, Category] = {}
+        self.concurrency_controller: Optional[AIMDController] = None
+        self._reload_lock = threading.Lock()
+        self._stop_watcher = threading.Event()
+        self._category_watcher: Optional[threading.Thread] = None
         self.load_all_categories()
+        if self.config.category_reload_interval:
+            self.start_category_watcher(self.config.category_reload_interval)
 
     def _initialize_services(self):
-        self.category_loader = CategoryLoader(self.config.examples_dir)
-        self.prompt_builder = PromptBuilder()
-        self.llm_service = LLMService(self.config.llm_config)
+        self.category_loader = CategoryLoader(
+            self.config.examples_dir,
+            self.config.category_index_path,
+            self.config.category_corpus_path,
+        )
+        self.prompt_builder = PromptBuilder(
+            self.config.example_stratify_by,
+            compact_profiles=self.config.compact_profiles,
+            token_budget=self.config.prompt_token_budget,
+            layout=self.config.prompt_layout,
+        )
         self.text_processor = TextProcessor()
         self.quality_evaluator = QualityEvaluator(
             self.config.min_word_count, self.config.max_word_count
         )
-        self.pii_factory = PIIGenerator()
+        # Serviços caros (cliente do LLM, Faker, pool de perfis) são criados
+        # no primeiro uso
+        self._services_lock = threading.Lock()
+        self._llm_service: Optional[LLMService] = None
+        # Um PIIGenerator (Faker + random.Random) por thread: threads do lote
+        # e o produtor do pool nunca disputam o mesmo estado
+        self._thread_pii = threading.local()
+        self._profile_pool: Optional[ProfilePool] = None
+
+    @property
+    def llm_service(self) -> LLMService:
+        if self._llm_service is None:
+            with self._services_lock:
+                if self._llm_service is None:
+                    self._llm_service = LLMService(self.config.llm_config)
+        return self._llm_service
+
+    @property
+    def pii_factory(self) -> PIIGenerator:
+        """Gerador de PII da thread atual, criado no primeiro uso"""
+        pii = getattr(self._thread_pii, "generator", None)
+        if pii is None:
+            pii = PIIGenerator(self.config.pii_backend)
+            self._thread_pii.generator = pii
+        return pii
+
+    @property
+    def profile_pool(self) -> Optional[ProfilePool]:
+        """Pool de perfis pré-gerados, iniciado no primeiro uso (ou None)"""
+        if self._profile_pool is None and self.config.use_profile_pool:
+            with self._services_lock:
+                if self._profile_pool is None:
+                    pool = ProfilePool(
+                        self._generate_profile,
+                        self.config.profile_pool_low_watermark,
+                        self.config.profile_pool_high_watermark,
+                    )
+                    pool.start()
+                    self._profile_pool = pool
+        return self._profile_pool
+
+    def close(self) -> None:
+        """Libera recursos em segundo plano (pool de perfis, hosts, cache)"""
+        self.stop_category_watcher()
+        if self._profile_pool is not None:
+            self._profile_pool.close()
+        if self._llm_service is not None:
+            self._llm_service.close()
 
     def load_all_categories(self) -> None:
-        self.categories = self.category_loader.load_all_categories()
+        """Lê o índice de categorias; os exemplos são carregados no primeiro uso"""
+        self.categories = self.category_loader.load_categories(
+            on_load=self._on_category_loaded
+        )
         if not self.categories:
             print("❌ Nenhuma categoria foi carregada!")
 
+    def reload_categories(self) -> bool:
+        """Relê apenas arquivos de exemplo novos ou alterados.
+
+        O novo mapeamento é montado à parte e trocado de uma vez: threads em
+        andamento continuam com as categorias que já obtiveram. Retorna True se
+        algo mudou.
+        """
+        with self._reload_lock:
+            categories = self.category_loader.reload(self.categories)
+            if categories is None:
+                return False
+            added = categories.keys() - self.categories.keys()
+            removed = self.categories.keys() - categories.keys()
+            self.categories = categories
+            for nome in removed:
+                self.quality_evaluator.unregister_category(nome)
+        print(
+            f"🔄 Categorias recarregadas ({len(categories)} no total, "
+            f"{len(added)} novas, {len(removed)} removidas)"
+        )
+        return True
+
+    def start_category_watcher(self, interval: float) -> None:
+        """Verifica o diretório de exemplos a cada ``interval`` segundos"""
+        if self._category_watcher is not None:
+            return
+        self._stop_watcher.clear()
+        self._category_watcher = threading.Thread(
+            target=self._watch_categories,
+            args=(interval,),
+            name="category-watcher",
+            daemon=True,
+        )
+        self._category_watcher.start()
+
+    def stop_category_watcher(self) -> None:
+        self._stop_watcher.set()
+        if self._category_watcher is not None:
+            self._category_watcher.join()
+            self._category_watcher = None
+
+    def _watch_categories(self, interval: float) -> None:
+        while not self._stop_watcher.wait(interval):
+            try:
+                self.reload_categories()
+            except Exception as e:
+                print(f"❌ Erro ao recarregar categorias: {e}")
+
+    def _on_category_loaded(self, category: Category) -> None:
+        self.quality_evaluator.register_category(category)
+        self.prompt_builder.prepare([category])
+
+    def quality_metric_names(self) -> List[str]:
+        """Métricas booleanas de todas as categorias (ex.: colunas do Parquet).
+
+        É a fonte das colunas de métricas da exportação. Os nomes das regras
+        declaradas nos JSON vêm do índice de categorias, já em memória: nenhuma
+        categoria é carregada.
+        """
+        return self.quality_evaluator.boolean_metric_names(
+            name for entry in self.categories.entries.values() for name in entry.regras
+        )
+
     def get_available_categories(self) -> List[str]:
         return list(self.categories.keys())
 
@@ -130,97 +286,363 @@ class ModularPromptGenerator:
         category_name: Optional[str] = None,
         num_profiles: Optional[int] = None,
         num_examples: Optional[int] = None,
+        seed: Optional[int] = None,
     ) -> Optional[GeneratedPrompt]:
-        if not self.categories:
-            print("❌ Nenhuma categoria disponível!")
+        selected_category = self._select_category(category_name)
+        if selected_category is None:
             return None
 
-        num_profiles = num_profiles or self.config.default_profiles
-        num_examples = num_examples or self.config.default_examples
+        try:
+            profiles, specialized_prompt = self._build_request(
+                selected_category, num_profiles, num_examples, seed
+            )
+            raw_response = self.llm_service.generate_response(
+                specialized_prompt,
+                seed=seed,
+                max_words=self._get_max_words(selected_category),
+            )
+            return self._finalize_prompt(
+                selected_category,
+                profiles,
+                raw_response,
+                seed=seed,
+                prompt_tokens=estimate_tokens(specialized_prompt),
+            )
+        except Exception as e:
+            print(f"❌ Erro durante geração: {e}")
+            return None
+
+    async def agenerate_prompt(
+        self,
+        category_name: Optional[str] = None,
+        num_profiles: Optional[int] = None,
+        num_examples: Optional[int] = None,
+        seed: Optional[int] = None,
+    ) -> Optional[GeneratedPrompt]:
+        """Versão assíncrona de generate_prompt"""
+        selected_category = self._select_category(category_name)
+        if selected_category is None:
+            return None
+
+        try:
+            profiles, specialized_prompt = self._build_request(
+                selected_category, num_profiles, num_examples, seed
+            )
+            raw_response = await self.llm_service.agenerate_response(
+                specialized_prompt,
+                seed=seed,
+                max_words=self._get_max_words(selected_category),
+            )
+            return self._finalize_prompt(
+                selected_category,
+                profiles,
+                raw_response,
+                seed=seed,
+                prompt_tokens=estimate_tokens(specialized_prompt),
+            )
+        except Exception as e:
+            print(f"❌ Erro durante geração: {e}")
+            return None
+
+    def _get_max_words(self, category: Category) -> int:
+        """Máximo de palavras aceito pelo avaliador, usado para cortar o streaming"""
+        return self.quality_evaluator.get_word_limits(category.nome)[1]
+
+    def _select_category(self, category_name: Optional[str]) -> Optional[Category]:
+        # Uma única leitura: um recarregamento pode trocar self.categories
+        categories = self.categories
+        if not categories:
+            print("❌ Nenhuma categoria disponível!")
+            return None
 
         if category_name:
-            if category_name not in self.categories:
+            selected_category = categories.get(category_name)
+            if selected_category is None:
                 print(f"❌ Categoria '{category_name}' não encontrada!")
                 return None
-            selected_category = self.categories[category_name]
         else:
-            category_name = random.choice(list(self.categories.keys()))
-            selected_category = self.categories[category_name]
+            category_name = random.choice(list(categories.keys()))
+            selected_category = categories.get(category_name)
+            if selected_category is None:
+                print(f"❌ Categoria '{category_name}' não encontrada!")
+                return None
 
         print(
             f"🎲 Categoria {'sorteada' if not category_name else 'selecionada'}: {category_name.upper()}"
         )
+        return selected_category
 
-        try:
+    def _build_request(
+        self,
+        category: Category,
+        num_profiles: Optional[int] = None,
+        num_examples: Optional[int] = None,
+        seed: Optional[int] = None,
+    ) -> Tuple[List, str]:
+        num_profiles = num_profiles or self.config.default_profiles
+        num_examples = num_examples or self.config.default_examples
+        # RNG próprio da requisição: o sorteio não depende de estado compartilhado
+        rng = random.Random(seed)
+
+        if seed is None:
             profiles = self._generate_profiles(num_profiles)
-            specialized_prompt = self.prompt_builder.build_specialized_prompt(
-                selected_category, profiles, num_examples
-            )
-            print(f">>> Gerando prompt especializado em '{category_name.upper()}'...")
-            raw_response = self.llm_service.generate_response(specialized_prompt)
-            cleaned_response = self.text_processor.clean_response(
-                raw_response, category_name
-            )
-            metrics, score, max_score = self.quality_evaluator.evaluate_quality(
-                cleaned_response, category_name
-            )
+        else:
+            profiles = self._generate_seeded_profiles(num_profiles, seed)
+        specialized_prompt = self.prompt_builder.build_specialized_prompt(
+            category, profiles, num_examples, rng=rng
+        )
+        print(f">>> Gerando prompt especializado em '{category.nome.upper()}'...")
+        return profiles, specialized_prompt
 
-            return GeneratedPrompt(
-                content=cleaned_response,
-                category=selected_category,
-                profiles=profiles,
-                metrics=metrics,
-                quality_score=score,
-                max_quality_score=max_score,
-            )
-        except Exception as e:
-            print(f"❌ Erro durante geração: {e}")
-            return None
+    def _finalize_prompt(
+        self,
+        category: Category,
+        profiles: List,
+        raw_response: str,
+        seed: Optional[int] = None,
+        prompt_tokens: Optional[int] = None,
+    ) -> GeneratedPrompt:
+        cleaned_response = self.text_processor.clean_response(
+            raw_response, category.nome
+        )
+        metrics, score, max_score = self.quality_evaluator.evaluate_quality(
+            cleaned_response, category.nome
+        )
+
+        compact = self.config.compact_results
+        return GeneratedPrompt(
+            content=cleaned_response,
+            category=category.to_ref() if compact else category,
+            profiles=None if compact else profiles,
+            metrics=metrics,
+            quality_score=score,
+            max_quality_score=max_score,
+            seed=seed,
+            prompt_tokens=prompt_tokens,
+        )
 
     def _generate_profiles(self, num_profiles: int) -> List:
+        profile_pool = self.profile_pool
+        if profile_pool is not None:
+            return profile_pool.take(num_profiles)
+        return [self._generate_profile() for _ in range(num_profiles)]
+
+    def _generate_seeded_profiles(self, num_profiles: int, seed: int) -> List:
+        # Perfis de jobs com seed não passam pelo pool: o gerador da thread é
+        # re-semeado com a seed do job, então o resultado não depende de qual
+        # thread executa o job nem da ordem de execução
+        pii = self.pii_factory
+        pii.reseed(seed)
         return [
-            self.pii_factory.get_full_profile(sex=random.choice(["M", "F"]))
+            pii.get_full_profile(sex=pii.rng.choice(["M", "F"]))
             for _ in range(num_profiles)
         ]
 
+    def _generate_profile(self) -> Dict[str, Any]:
+        pii = self.pii_factory
+        return pii.get_full_profile(sex=pii.rng.choice(["M", "F"]))
+
     def batch_generate(
-        self, num_prompts: int = 5, category_filter: Optional[List[str]] = None
+        self,
+        num_prompts: int = 5,
+        category_filter: Optional[List[str]] = None,
+        seed: Optional[int] = None,
     ) -> List[GeneratedPrompt]:
-        results = []
+        """Gera um lote e retorna os prompts na ordem dos jobs.
+
+        Com ``seed`` categorias e perfis são os mesmos para qualquer número de
+        workers.
+        """
+        prompts = list(self.iter_generate(num_prompts, category_filter, seed=seed))
+        prompts.sort(key=lambda prompt: prompt.job_index)
+        return prompts
+
+    def plan_jobs(
+        self,
+        num_prompts: int,
+        category_filter: Optional[List[str]] = None,
+        seed: Optional[int] = None,
+    ) -> List[PlannedJob]:
+        """Planeja a sequência de categorias e seeds de um lote.
+
+        Com a mesma ``seed`` (e as mesmas categorias) o plano é sempre o mesmo.
+        """
+        return list(self._iter_jobs(num_prompts, category_filter, seed))
+
+    def _iter_jobs(
+        self,
+        num_prompts: int,
+        category_filter: Optional[List[str]] = None,
+        seed: Optional[int] = None,
+    ) -> Iterator[PlannedJob]:
         available_categories = (
             category_filter if category_filter else self.get_available_categories()
         )
+        return iter_jobs(available_categories, num_prompts, seed)
 
-        if not available_categories:
+    def iter_generate(
+        self,
+        num_prompts: int = 5,
+        category_filter: Optional[List[str]] = None,
+        max_workers: Optional[int] = None,
+        jobs: Optional[List[PlannedJob]] = None,
+        seed: Optional[int] = None,
+        ordered: bool = False,
+    ) -> Iterator[GeneratedPrompt]:
+        """Gera prompts em paralelo, entregando cada um assim que fica pronto.
+
+        Apenas ``2 * max_workers`` gerações ficam pendentes ao mesmo tempo, então
+        o uso de memória não cresce com ``num_prompts``. Com
+        ``AppConfig.adaptive_concurrency`` o número de gerações simultâneas é
+        ajustado por um ``AIMDController`` (exposto em
+        ``self.concurrency_controller``) entre ``min_in_flight`` e
+        ``max_workers``. Com ``jobs`` (ver ``plan_jobs``) os jobs informados são
+        executados no lugar de um sorteio; com ``seed`` o sorteio é o de
+        ``plan_jobs(num_prompts, category_filter, seed)``. Cada prompt gerado
+        traz o ``job_index`` correspondente. Com ``ordered`` os prompts saem na
+        ordem dos jobs; os que ficam prontos antes dos anteriores aguardam e
+        contam na janela de gerações pendentes.
+        """
+        if jobs is not None:
+            num_prompts = len(jobs)
+            jobs_to_generate = iter(jobs)
+        elif category_filter or self.get_available_categories():
+            jobs_to_generate = self._iter_jobs(num_prompts, category_filter, seed)
+        else:
             print("❌ Nenhuma categoria disponível para geração em lote!")
-            return results
+            return
 
-        # Cria uma lista de categorias para gerar, uma para cada prompt
-        categories_to_generate = [
-            random.choice(available_categories) for _ in range(num_prompts)
-        ]
+        max_workers = max_workers or self.config.max_in_flight
+        controller = None
+        if self.config.adaptive_concurrency:
+            controller = AIMDController(
+                min(self.config.min_in_flight, max_workers), max_workers
+            )
+            self.concurrency_controller = controller
+
+        def window() -> int:
+            return controller.limit if controller else 2 * max_workers
+
+        from tqdm import tqdm
 
         print(f"\n🔄 Gerando {num_prompts} prompts em paralelo...")
 
-        # Usa ThreadPoolExecutor para executar as gerações em paralelo
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            # O executor.map aplica a função generate_prompt a cada categoria na lista
-            # e coleta os resultados. O tqdm cria uma barra de progresso.
-            future_to_prompt = {
-                executor.submit(self.generate_prompt, cat): cat
-                for cat in categories_to_generate
-            }
-
-            for future in tqdm(
-                concurrent.futures.as_completed(future_to_prompt),
-                total=num_prompts,
-                desc="Gerando Prompts",
-            ):
-                prompt = future.result()
+        with concurrent.futures.ThreadPoolExecutor(max_workers) as executor, tqdm(
+            total=num_prompts, desc="Gerando Prompts"
+        ) as progress:
+            pending = {}
+            # Resultados à espera dos anteriores (só com ordered)
+            finished = {}
+            submitted = 0
+            next_to_yield = 0
+
+            def submit_next() -> bool:
+                nonlocal submitted
+                if len(pending) + len(finished) >= window():
+                    return False
+                job = next(jobs_to_generate, None)
+                if job is None:
+                    return False
+                pending[executor.submit(self._timed_generate, job)] = (submitted, job)
+                submitted += 1
+                return True
+
+            def deliver(job: PlannedJob, prompt: Optional[GeneratedPrompt]):
                 if prompt:
-                    results.append(prompt)
+                    prompt.job_index = job.index
                 else:
-                    category = future_to_prompt[future]
-                    print(f"❌ Falha ao gerar prompt para a categoria '{category}'")
+                    print(f"❌ Falha ao gerar prompt para a categoria '{job.category}'")
+                return prompt
+
+            while submit_next():
+                pass
+
+            while pending:
+                done, _ = concurrent.futures.wait(
+                    pending, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for future in done:
+                    position, job = pending.pop(future)
+                    progress.update(1)
+
+                    prompt, latency = future.result()
+                    if controller:
+                        # Latência por palavra: respostas longas não contam
+                        # como congestionamento
+                        words = prompt.metrics.get("word_count") if prompt else None
+                        controller.record(latency, prompt is not None, work=words)
+                        progress.set_postfix(limite=controller.limit)
+
+                    if ordered:
+                        finished[position] = (job, prompt)
+                    elif deliver(job, prompt):
+                        yield prompt
+
+                while next_to_yield in finished:
+                    job, prompt = finished.pop(next_to_yield)
+                    next_to_yield += 1
+                    if deliver(job, prompt):
+                        yield prompt
+
+                while submit_next():
+                    pass
+
+    def _timed_generate(
+        self, job: PlannedJob
+    ) -> Tuple[Optional[GeneratedPrompt], float]:
+        start = time.perf_counter()
+        prompt = self.generate_prompt(job.category, seed=job.seed)
+        return prompt, time.perf_counter() - start
+
+    async def abatch_generate(
+        self,
+        num_prompts: int = 5,
+        category_filter: Optional[List[str]] = None,
+        max_in_flight: Optional[int] = None,
+        seed: Optional[int] = None,
+    ) -> List[GeneratedPrompt]:
+        """Gera prompts em lote com asyncio, limitando as requisições simultâneas.
+
+        Os prompts voltam na ordem dos jobs; com ``seed`` o lote é reproduzível.
+        """
+        results = []
+        available_categories = (
+            category_filter if category_filter else self.get_available_categories()
+        )
+
+        if not available_categories:
+            print("❌ Nenhuma categoria disponível para geração em lote!")
+            return results
+
+        max_in_flight = max_in_flight or self.config.max_in_flight
+        # Gerador compartilhado pelos workers: os jobs são sorteados sob demanda
+        jobs_to_generate = iter_jobs(available_categories, num_prompts, seed)
+
+        print(
+            f"\n🔄 Gerando {num_prompts} prompts de forma assíncrona "
+            f"(até {max_in_flight} simultâneos)..."
+        )
+
+        import asyncio
+        from tqdm import tqdm
+
+        with tqdm(total=num_prompts, desc="Gerando Prompts") as progress:
+
+            async def worker() -> None:
+                for job in jobs_to_generate:
+                    prompt = await self.agenerate_prompt(job.category, seed=job.seed)
+                    if prompt:
+                        prompt.job_index = job.index
+                        results.append(prompt)
+                    else:
+                        print(
+                            f"❌ Falha ao gerar prompt para a categoria '{job.category}'"
+                        )
+                    progress.update(1)
+
+            await asyncio.gather(
+                *(worker() for _ in range(min(max_in_flight, num_prompts)))
+            )
 
+        results.sort(key=lambda prompt: prompt.job_index)
         return results
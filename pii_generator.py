@@ -1,27 +1,57 @@
 import random
 import unicodedata
-from faker import Faker
-from fordev import generators
+from datetime import date
+
+from utils import document_generators
+
+PII_BACKENDS = ("local", "fordev")
+# Intervalo fixo (e não relativo a hoje) para que perfis com seed se repitam
+BIRTH_DATE_START = date(1955, 1, 1)
+BIRTH_DATE_END = date(2006, 12, 31)
 
 
 class PIIGenerator:
-    def __init__(self):
+    """Gera perfis fictícios.
+
+    O backend "local" gera todos os documentos em processo, sem acesso à rede.
+    O backend "fordev" consulta o site do 4devs e usa os geradores locais como
+    fallback.
+
+    Com ``seed`` (ou após ``reseed``) o backend "local" gera sempre os mesmos
+    perfis: todo o sorteio usa ``self.rng`` e a instância própria do Faker.
+    """
+
+    def __init__(self, backend="local", seed=None):
+        if backend not in PII_BACKENDS:
+            raise ValueError(
+                f"Backend de PII inválido '{backend}'. Opções: {', '.join(PII_BACKENDS)}"
+            )
+        self.backend = backend
+        from faker import Faker  # import pesado, adiado até o primeiro perfil
+
+        self.rng = random.Random(seed)
         self.fake = Faker("pt_BR")
+        if seed is not None:
+            self.fake.seed_instance(seed)
+        self._fordev = None
+        if backend == "fordev":
+            from fordev import generators
+
+            self._fordev = generators
+
+    def reseed(self, seed):
+        """Reinicia o sorteio, tornando os próximos perfis reproduzíveis"""
+        self.rng.seed(seed)
+        self.fake.seed_instance(seed)
 
     def get_person_profile(self, sex="R"):
         try:
-            person_data = generators.people(sex=sex, data_only=True)[0]
+            if self._fordev is None:
+                person_data = self._get_local_person(sex)
+            else:
+                person_data = self._fordev.people(sex=sex, data_only=True)[0]
         except Exception:
-            person_data = {
-                "nome": self.fake.name(),
-                "data_nasc": self.fake.date_of_birth().strftime("%d/%m/%Y"),
-                "cpf": generators.cpf(data_only=True),
-                "endereco": self.fake.street_name(),
-                "numero": str(random.randint(1, 9999)),
-                "cep": self.fake.postcode(),
-                "cidade": self.fake.city(),
-                "estado": self.fake.state_abbr(),
-            }
+            person_data = self._get_local_person(sex)
 
         person_data["job"] = self.fake.job()
         first_name = person_data["nome"].split(" ")[0].lower()
@@ -44,6 +74,27 @@ class PIIGenerator:
 
         return person_data
 
+    def _get_local_person(self, sex="R"):
+        if sex == "M":
+            name = self.fake.name_male()
+        elif sex == "F":
+            name = self.fake.name_female()
+        else:
+            name = self.fake.name()
+
+        return {
+            "nome": name,
+            "data_nasc": self.fake.date_between_dates(
+                BIRTH_DATE_START, BIRTH_DATE_END
+            ).strftime("%d/%m/%Y"),
+            "cpf": document_generators.cpf(rng=self.rng),
+            "endereco": self.fake.street_name(),
+            "numero": str(self.rng.randint(1, 9999)),
+            "cep": self.fake.postcode(),
+            "cidade": self.fake.city(),
+            "estado": self.fake.state_abbr(),
+        }
+
     def _normalize_string(self, text):
 
         normalized = unicodedata.normalize("NFD", text)
@@ -51,62 +102,88 @@ class PIIGenerator:
 
     def get_vehicle_info(self):
         try:
-            brand_code = random.choice([27, 33, 29, 85, 82, 37])
-            vehicle_data = generators.vehicle(brand_code=brand_code, data_only=True)
+            if self._fordev is None:
+                vehicle_data = document_generators.vehicle(rng=self.rng)
+                plate = document_generators.vehicle_plate(rng=self.rng)
+                renavam = document_generators.renavam(rng=self.rng)
+            else:
+                brand_code = self.rng.choice([27, 33, 29, 85, 82, 37])
+                vehicle_data = self._fordev.vehicle(
+                    brand_code=brand_code, data_only=True
+                )
+                plate = self._fordev.vehicle_plate(data_only=True)
+                renavam = self._fordev.renavam(data_only=True)
 
             return {
                 "vehicle": f"{vehicle_data.get('brand', 'Marca')} {vehicle_data.get('model', 'Modelo')}",
-                "vehicle_plate": generators.vehicle_plate(data_only=True),
-                "renavam": generators.renavam(data_only=True),
+                "vehicle_plate": plate,
+                "renavam": renavam,
             }
         except Exception:
+            vehicle_data = document_generators.vehicle(rng=self.rng)
             return {
-                "vehicle": f"{self.fake.word().title()} {self.fake.word().title()}",
-                "vehicle_plate": f"{self.fake.lexify('???-????').upper()}",
-                "renavam": f"{random.randint(10000000000, 99999999999)}",
+                "vehicle": f"{vehicle_data['brand']} {vehicle_data['model']}",
+                "vehicle_plate": document_generators.vehicle_plate(rng=self.rng),
+                "renavam": document_generators.renavam(rng=self.rng),
             }
 
     def get_corporate_expense_info(self):
         try:
-            card_data = generators.credit_card(
-                bank=random.choice([1, 2]), data_only=True
-            )
+            if self._fordev is None:
+                card_data = document_generators.credit_card(
+                    self.rng.choice(["Visa", "Mastercard", "Elo"]), rng=self.rng
+                )
+            else:
+                card_data = self._fordev.credit_card(
+                    bank=self.rng.choice([1, 2]), data_only=True
+                )
             return {
                 "credit_card": card_data.get("credit_card", ""),
                 "credit_card_brand": card_data.get("credit_card_brand", "Visa"),
-                "expense_value": f"R$ {random.randint(150, 800)},00",
+                "expense_value": f"R$ {self.rng.randint(150, 800)},00",
             }
         except Exception:
             return {
-                "credit_card": self.fake.credit_card_number(),
-                "credit_card_brand": random.choice(["Visa", "Mastercard", "Elo"]),
-                "expense_value": f"R$ {random.randint(150, 800)},00",
+                **document_generators.credit_card(
+                    self.rng.choice(["Visa", "Mastercard", "Elo"]), rng=self.rng
+                ),
+                "expense_value": f"R$ {self.rng.randint(150, 800)},00",
             }
 
     def get_previous_employer_info(self):
         try:
-            company_data = generators.company(data_only=True)
+            if self._fordev is None:
+                company_data = self._get_local_company()
+            else:
+                company_data = self._fordev.company(data_only=True)
             return {
                 "previous_employer_name": company_data.get("nome", ""),
                 "previous_employer_cnpj": company_data.get("cnpj", ""),
             }
         except Exception:
+            company_data = self._get_local_company()
             return {
-                "previous_employer_name": f"{self.fake.company()} {random.choice(['Ltda', 'S.A.', 'EIRELI'])}",
-                "previous_employer_cnpj": generators.cnpj(data_only=True),
+                "previous_employer_name": company_data["nome"],
+                "previous_employer_cnpj": company_data["cnpj"],
             }
 
+    def _get_local_company(self):
+        return {
+            "nome": f"{self.fake.company()} {self.rng.choice(['Ltda', 'S.A.', 'EIRELI'])}",
+            "cnpj": document_generators.cnpj(rng=self.rng),
+        }
+
     def get_medical_info(self):
         cids = ["A09", "J06.9", "K02.1", "M54.5", "Z76.5"]
         return {
-            "cid": random.choice(cids),
+            "cid": self.rng.choice(cids),
             "doctor_name": f"Dr(a). {self.fake.name()}",
             "hospital": f"Hospital {self.fake.city()}",
         }
 
     def get_legal_info(self):
         return {
-            "legal_case_number": f"{random.randint(10000, 99999)}-{random.randint(10,99)}.{self.fake.year()}.5.02.{random.randint(1000,9999)}",
+            "legal_case_number": f"{self.rng.randint(10000, 99999)}-{self.rng.randint(10,99)}.{self.rng.randint(2000, 2024)}.5.02.{self.rng.randint(1000,9999)}",
             "lawyer_name": f"Dr(a). {self.fake.name()}",
         }
 
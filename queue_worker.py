@@ -0,0 +1,203 @@
+"""Workers que consomem uma fila de jobs compartilhada (ver services/job_queue.py).
+
+Várias máquinas apontam para o mesmo arquivo de fila em um sistema de arquivos
+compartilhado; cada job é concluído uma única vez, e a vazão cresce com o
+número de workers.
+
+Uso:
+    python queue_worker.py enqueue --queue fila.sqlite --num-prompts 1000 --seed 42
+    python queue_worker.py work --queue fila.sqlite
+    python queue_worker.py status --queue fila.sqlite
+    python queue_worker.py export --queue fila.sqlite --output outputs/prompts.jsonl
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import random
+import socket
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterator
+
+from config.settings import AppConfig, LLMConfig
+from models.job import iter_jobs
+from modular_prompt_generator import ModularPromptGenerator
+from services.category_loader import CategoryLoader
+from services.job_queue import JobQueue, Lease
+from utils.export_utils import PromptExporter
+
+
+def enqueue(args) -> None:
+    seed = args.seed if args.seed is not None else random.randrange(2**31)
+    categories = (
+        args.categories.split(",")
+        if args.categories
+        else list(
+            CategoryLoader(
+                Path(args.examples_dir), AppConfig().category_index_path
+            ).build_index()
+        )
+    )
+    queue = JobQueue(args.queue)
+    try:
+        jobs = queue.enqueue(iter_jobs(categories, args.num_prompts, seed))
+    finally:
+        queue.close()
+    if jobs:
+        print(
+            f"📥 {len(jobs)} jobs adicionados a {args.queue} (seed {seed}, "
+            f"índices {jobs[0].index} a {jobs[-1].index})"
+        )
+    else:
+        print("❌ Nenhuma categoria disponível para enfileirar")
+
+
+@contextlib.contextmanager
+def keep_leases(
+    queue: JobQueue, pending: Dict[int, Lease], interval: float
+) -> Iterator[None]:
+    """Renova os empréstimos ainda pendentes a cada ``interval`` segundos"""
+    stop = threading.Event()
+
+    def renew_loop() -> None:
+        while not stop.wait(interval):
+            for lease in list(pending.values()):
+                # Um job concluído entre a cópia e a renovação não está perdido
+                if not queue.renew(lease) and lease.job.index in pending:
+                    print(f"⚠️  Empréstimo do job {lease.job.index} foi perdido")
+
+    renewer = threading.Thread(target=renew_loop, name="lease-renewer", daemon=True)
+    renewer.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        renewer.join()
+
+
+def work(args) -> None:
+    worker_id = args.worker_id or f"{socket.gethostname()}-{os.getpid()}"
+    config = AppConfig(llm_config=LLMConfig(), use_profile_pool=False)
+    batch_size = args.batch_size or config.max_in_flight
+    queue = JobQueue(args.queue, lease_seconds=args.lease_seconds)
+    generator = ModularPromptGenerator(config)
+    completed = 0
+
+    print(f"👷 Worker {worker_id} consumindo {args.queue}")
+    try:
+        while True:
+            leases = queue.lease(worker_id, batch_size)
+            if not leases:
+                if queue.is_drained():
+                    break
+                # Jobs emprestados a outros workers podem voltar se expirarem
+                time.sleep(args.poll_interval)
+                continue
+
+            pending = {lease.job.index: lease for lease in leases}
+            with keep_leases(queue, pending, args.lease_seconds / 3):
+                completed += run_batch(generator, queue, pending, batch_size)
+
+            for lease in pending.values():
+                queue.fail(lease, "falha na geração")
+    finally:
+        generator.close()
+        queue.close()
+
+    print(f"✅ Worker {worker_id} concluiu {completed} jobs")
+
+
+def run_batch(
+    generator: ModularPromptGenerator,
+    queue: JobQueue,
+    pending: Dict[int, Lease],
+    batch_size: int,
+) -> int:
+    """Gera os jobs emprestados, concluindo cada um assim que fica pronto"""
+    completed = 0
+    for prompt in generator.iter_generate(
+        jobs=[lease.job for lease in pending.values()], max_workers=batch_size
+    ):
+        lease = pending.pop(prompt.job_index)
+        record = PromptExporter.to_jsonl_record(prompt, prompt_id=None)
+        del record["prompt_id"]
+        if queue.complete(lease, record):
+            completed += 1
+        else:
+            print(f"⚠️  Job {lease.job.index} já foi concluído por outro worker")
+    return completed
+
+
+def status(args) -> None:
+    queue = JobQueue(args.queue)
+    stats = queue.stats()
+    queue.close()
+    print(
+        f"📊 {stats['done']} concluídos, {stats['leased']} em andamento, "
+        f"{stats['pending']} pendentes, {stats['failed']} falhos"
+    )
+
+
+def export(args) -> None:
+    queue = JobQueue(args.queue)
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    count = 0
+    with open(args.output, "w", encoding="utf-8") as f:
+        for count, result in enumerate(queue.iter_results(), start=1):
+            record = {"prompt_id": count, **result}
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    queue.close()
+    print(f"✅ {count} prompts exportados para {args.output} (formato JSONL)")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Fila de jobs de geração de prompts")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    enqueue_parser = subparsers.add_parser("enqueue", help="Adiciona jobs à fila")
+    enqueue_parser.add_argument("--queue", type=Path, required=True)
+    enqueue_parser.add_argument("--num-prompts", type=int, default=100)
+    enqueue_parser.add_argument("--seed", type=int, default=None)
+    enqueue_parser.add_argument("--categories", default=None)
+    enqueue_parser.add_argument("--examples-dir", default="examples")
+    enqueue_parser.set_defaults(handler=enqueue)
+
+    work_parser = subparsers.add_parser("work", help="Consome jobs até a fila esvaziar")
+    work_parser.add_argument("--queue", type=Path, required=True)
+    work_parser.add_argument("--worker-id", default=None)
+    work_parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=None,
+        help="Jobs emprestados por vez (padrão: AppConfig.max_in_flight)",
+    )
+    work_parser.add_argument("--lease-seconds", type=float, default=600.0)
+    work_parser.add_argument("--poll-interval", type=float, default=5.0)
+    work_parser.set_defaults(handler=work)
+
+    status_parser = subparsers.add_parser("status", help="Mostra o estado da fila")
+    status_parser.add_argument("--queue", type=Path, required=True)
+    status_parser.set_defaults(handler=status)
+
+    export_parser = subparsers.add_parser(
+        "export", help="Exporta os resultados concluídos em JSONL"
+    )
+    export_parser.add_argument("--queue", type=Path, required=True)
+    export_parser.add_argument(
+        "--output", type=Path, default=Path("outputs/prompts_export.jsonl")
+    )
+    export_parser.set_defaults(handler=export)
+
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+import asyncio
+import threading
+import time
+from typing import Dict, List, Optional, Sequence
+
+import httpx
+import ollama
+
+
+class OllamaBackend:
+    """Um host Ollama do pool, com seus contadores"""
+
+    def __init__(self, host: str):
+        self.host = host if "://" in host else f"http://{host}"
+        self.client = ollama.Client(host=self.host)
+        self.healthy = True
+        self.in_flight = 0
+        self.completed = 0
+        self.errors = 0
+        self.consecutive_failures = 0
+        self.total_latency = 0.0
+        self._async_client = None
+        self._async_loop = None
+
+    def get_async_client(self) -> ollama.AsyncClient:
+        """Retorna o cliente assíncrono do event loop atual"""
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_loop is not loop:
+            self._async_client = ollama.AsyncClient(host=self.host)
+            self._async_loop = loop
+        return self._async_client
+
+
+class BackendPool:
+    """Distribui requisições entre vários hosts Ollama.
+
+    Cada requisição vai para o host saudável com menos requisições em
+    andamento. Após ``failure_threshold`` falhas seguidas o host é retirado
+    do pool; a verificação periódica de saúde o readmite quando ele volta a
+    responder. O último host saudável nunca é retirado: sem alternativa, é
+    melhor continuar tentando nele do que recusar todas as requisições.
+    """
+
+    def __init__(
+        self,
+        hosts: Sequence[str],
+        health_check_interval: float = 10.0,
+        failure_threshold: int = 3,
+        health_check_timeout: float = 2.0,
+    ):
+        if not hosts:
+            raise ValueError("O pool precisa de pelo menos um host")
+        self.backends: List[OllamaBackend] = [OllamaBackend(host) for host in hosts]
+        self.health_check_interval = health_check_interval
+        self.failure_threshold = failure_threshold
+        self.health_check_timeout = health_check_timeout
+        self._lock = threading.Lock()
+        self._next = 0
+        self._started_at = time.monotonic()
+        self._stop = threading.Event()
+        self._health_thread: Optional[threading.Thread] = None
+
+    def acquire(self) -> OllamaBackend:
+        """Escolhe o host saudável com menos requisições em andamento"""
+        with self._lock:
+            candidates = [b for b in self.backends if b.healthy]
+            if not candidates:
+                raise RuntimeError("Nenhum host Ollama saudável disponível")
+            return self._pick(candidates)
+
+    def acquire_other(self, failed: OllamaBackend) -> Optional[OllamaBackend]:
+        """Escolhe outro host saudável para repetir uma requisição que falhou
+        em ``failed``; None se não houver alternativa"""
+        with self._lock:
+            candidates = [b for b in self.backends if b.healthy and b is not failed]
+            return self._pick(candidates) if candidates else None
+
+    def _pick(self, candidates: List[OllamaBackend]) -> OllamaBackend:
+        # Rotaciona o ponto de partida para desempatar entre hosts ociosos
+        start = self._next % len(candidates)
+        self._next += 1
+        rotated = candidates[start:] + candidates[:start]
+        backend = min(rotated, key=lambda b: b.in_flight)
+        backend.in_flight += 1
+        return backend
+
+    def release(self, backend: OllamaBackend, latency: float, success: bool) -> None:
+        with self._lock:
+            backend.in_flight -= 1
+            if success:
+                backend.completed += 1
+                backend.total_latency += latency
+                backend.consecutive_failures = 0
+            else:
+                backend.errors += 1
+                backend.consecutive_failures += 1
+                if backend.consecutive_failures >= self.failure_threshold:
+                    self._eject(backend)
+
+    def start_health_checks(self) -> None:
+        """Inicia a verificação periódica de saúde em segundo plano"""
+        if self._health_thread is not None:
+            return
+        self._health_thread = threading.Thread(
+            target=self._health_loop, name="ollama-health", daemon=True
+        )
+        self._health_thread.start()
+
+    def check_health(self) -> None:
+        """Verifica todos os hosts uma vez, removendo ou readmitindo cada um"""
+        for backend in self.backends:
+            try:
+                response = httpx.get(
+                    f"{backend.host}/api/version", timeout=self.health_check_timeout
+                )
+                healthy = response.status_code == 200
+            except httpx.HTTPError:
+                healthy = False
+
+            with self._lock:
+                if healthy and not backend.healthy:
+                    print(f"✅ Host {backend.host} readmitido no pool")
+                    backend.consecutive_failures = 0
+                    backend.healthy = True
+                elif not healthy:
+                    self._eject(backend)
+
+    def _eject(self, backend: OllamaBackend) -> None:
+        # Chamado com o lock adquirido
+        if not backend.healthy:
+            return
+        if not any(b.healthy for b in self.backends if b is not backend):
+            return
+        print(f"⚠️  Host {backend.host} removido do pool")
+        backend.healthy = False
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Contadores e vazão (requisições/s) de cada host"""
+        elapsed = max(time.monotonic() - self._started_at, 1e-9)
+        with self._lock:
+            return {
+                backend.host: {
+                    "healthy": backend.healthy,
+                    "in_flight": backend.in_flight,
+                    "completed": backend.completed,
+                    "errors": backend.errors,
+                    "avg_latency": (
+                        backend.total_latency / backend.completed
+                        if backend.completed
+                        else 0.0
+                    ),
+                    "throughput": backend.completed / elapsed,
+                }
+                for backend in self.backends
+            }
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._health_thread is not None:
+            self._health_thread.join()
+            self._health_thread = None
+
+    def _health_loop(self) -> None:
+        while not self._stop.wait(self.health_check_interval):
+            self.check_health()
@@ -0,0 +1,140 @@
+import hashlib
+import mmap
+import pickle
+import struct
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, Optional, Tuple
+
+from models.category import Category, Example
+
+if TYPE_CHECKING:
+    from services.category_loader import CategoryIndexEntry
+
+MAGIC = b"PGCORPUS\x03"
+HEADER = struct.Struct("<Q32s")  # tamanho e sha256 do índice
+
+
+class CategoryCorpus:
+    """Corpus binário das categorias, mapeado em memória.
+
+    Formato: ``MAGIC``, tamanho e sha256 do índice, o índice (pickle de
+    ``(entrada, offset, tamanho, sha256)`` por arquivo de origem) e, em
+    seguida, um bloco por categoria. Abrir o corpus lê só o índice; cada
+    categoria é desempacotada (e seu hash conferido) no primeiro uso.
+
+    O conteúdo é pickle: use apenas corpus gerados localmente por ``write``.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        index: Dict[str, Tuple["CategoryIndexEntry", int, int, bytes]],
+        data: mmap.mmap,
+        data_start: int,
+    ):
+        self.path = path
+        self.index = index
+        self._data = data
+        self._data_start = data_start
+
+    @classmethod
+    def open(cls, path: Path) -> Optional["CategoryCorpus"]:
+        """Abre o corpus; None se ausente, de outra versão ou corrompido"""
+        try:
+            with open(path, "rb") as f:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            return None
+
+        index_start = len(MAGIC) + HEADER.size
+        if data[: len(MAGIC)] != MAGIC or len(data) < index_start:
+            print(f"⚠️  Corpus {path} em formato desconhecido, usando os JSON")
+            data.close()
+            return None
+        index_size, digest = HEADER.unpack_from(data, len(MAGIC))
+        index_bytes = data[index_start : index_start + index_size]
+        if hashlib.sha256(index_bytes).digest() != digest:
+            print(f"⚠️  Corpus {path} corrompido, usando os JSON")
+            data.close()
+            return None
+
+        index = {item[0].path: item for item in pickle.loads(index_bytes)}
+        return cls(Path(path), index, data, index_start + index_size)
+
+    @staticmethod
+    def write(
+        path: Path, items: Iterable[Tuple["CategoryIndexEntry", Category]]
+    ) -> int:
+        """Grava as categorias no corpus; retorna quantas foram gravadas"""
+        index = []
+        blocks = []
+        offset = 0
+        for entry, category in items:
+            block = pickle.dumps(_pack(category), protocol=pickle.HIGHEST_PROTOCOL)
+            index.append((entry, offset, len(block), hashlib.sha256(block).digest()))
+            blocks.append(block)
+            offset += len(block)
+        index_bytes = pickle.dumps(index, protocol=pickle.HIGHEST_PROTOCOL)
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(MAGIC)
+            f.write(HEADER.pack(len(index_bytes), hashlib.sha256(index_bytes).digest()))
+            f.write(index_bytes)
+            f.writelines(blocks)
+        tmp_path.replace(path)
+        return len(index)
+
+    def entries(self) -> Iterable["CategoryIndexEntry"]:
+        return (item[0] for item in self.index.values())
+
+    def load(self, entry: "CategoryIndexEntry") -> Optional[Category]:
+        """Categoria compilada de ``entry``; None se o arquivo mudou desde então"""
+        item = self.index.get(entry.path)
+        if item is None or item[0] != entry:
+            return None
+        _, offset, size, digest = item
+        start = self._data_start + offset
+        block = self._data[start : start + size]
+        if hashlib.sha256(block).digest() != digest:
+            print(f"⚠️  Bloco de '{entry.nome}' corrompido no corpus, usando o JSON")
+            return None
+        return _unpack(pickle.loads(block))
+
+    def close(self) -> None:
+        self._data.close()
+
+
+# Tuplas simples: recriar os objetos a partir delas é bem mais rápido do que
+# deserializar as dataclasses com pickle
+def _pack(category: Category) -> tuple:
+    return (
+        category.nome,
+        category.descricao,
+        [
+            (
+                example.prompt,
+                example.subcategoria,
+                example.complexidade,
+                dict(example.metadata) if example.metadata else None,
+            )
+            for example in category.exemplos
+        ],
+        category.diretrizes_especificas,
+        category.metricas_qualidade,
+        category.campos_perfil,
+    )
+
+
+def _unpack(packed: tuple) -> Category:
+    nome, descricao, exemplos, diretrizes, metricas, campos = packed
+    return Category(
+        nome=nome,
+        descricao=descricao,
+        exemplos=[Example(*example) for example in exemplos],
+        diretrizes_especificas=diretrizes,
+        metricas_qualidade=metricas,
+        campos_perfil=campos,
+    )
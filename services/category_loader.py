@@ -1,14 +1,212 @@
 import json
+import threading
 from pathlib import Path
-from typing import Dict, Optional
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
 from models.category import Category, Example
+from services.category_corpus import CategoryCorpus
+
+
+class CategoryIndexEntry(NamedTuple):
+    """Resumo de um arquivo de categoria, suficiente para listar e sortear"""
+
+    nome: str
+    path: str
+    descricao: str
+    num_exemplos: int
+    mtime: float
+    size: int
+    # Nomes das regras declaradas em metricas_qualidade: as métricas de todas
+    # as categorias saem do índice, sem carregá-las
+    regras: Tuple[str, ...] = ()
+
+
+class LazyCategories(Mapping[str, Category]):
+    """Categorias do índice, carregadas do arquivo no primeiro acesso.
+
+    Listar nomes (``keys``, ``in``, ``len``) usa só o índice. ``on_load`` é
+    chamado uma vez para cada categoria carregada.
+    """
+
+    def __init__(
+        self,
+        loader: "CategoryLoader",
+        entries: Dict[str, CategoryIndexEntry],
+        on_load: Optional[Callable[[Category], None]] = None,
+    ):
+        self.loader = loader
+        self.entries = entries
+        self.on_load = on_load
+        self._loaded: Dict[str, Category] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, nome: str) -> Category:
+        category = self._loaded.get(nome)
+        if category is not None:
+            return category
+
+        entry = self.entries[nome]
+        with self._lock:
+            category = self._loaded.get(nome)
+            if category is None:
+                category = self.loader.load_category(entry)
+                if category is None:
+                    raise KeyError(nome)
+                if self.on_load is not None:
+                    self.on_load(category)
+                self._loaded[nome] = category
+        return category
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, nome: object) -> bool:
+        return nome in self.entries
+
+    def is_loaded(self, nome: str) -> bool:
+        return nome in self._loaded
 
 
 class CategoryLoader:
-    """Responsável por carregar categorias de arquivos JSON"""
+    """Responsável por carregar categorias de arquivos JSON.
+
+    ``load_categories`` lê só o índice (nome, caminho, número de exemplos,
+    mtime e tamanho de cada arquivo), salvo em ``index_path``; apenas arquivos
+    novos ou alterados são lidos para atualizá-lo, e os exemplos de cada
+    categoria só são carregados quando ela é usada.
 
-    def __init__(self, examples_dir: Path):
+    Com ``corpus_path`` (gerado por ``compile_corpus``) as categorias cujos
+    arquivos não mudaram desde a compilação vêm do corpus binário; as demais
+    são lidas do JSON.
+    """
+
+    INDEX_VERSION = 2
+
+    def __init__(
+        self,
+        examples_dir: Path,
+        index_path: Optional[Path] = None,
+        corpus_path: Optional[Path] = None,
+    ):
         self.examples_dir = examples_dir
+        self.index_path = Path(index_path) if index_path else None
+        self.corpus_path = Path(corpus_path) if corpus_path else None
+        self._corpus: Optional[CategoryCorpus] = None
+        self._corpus_checked = False
+        # (mtime, size) dos arquivos que falharam ao indexar: só são relidos
+        # quando mudam de novo
+        self._failed: Dict[str, Tuple[float, int]] = {}
+
+    def load_categories(
+        self, on_load: Optional[Callable[[Category], None]] = None
+    ) -> LazyCategories:
+        """Categorias com carregamento sob demanda, a partir do índice"""
+        return LazyCategories(self, self.build_index(), on_load)
+
+    def reload(self, current: LazyCategories) -> Optional[LazyCategories]:
+        """Recarrega só arquivos novos ou alterados; None se nada mudou.
+
+        Categorias inalteradas já carregadas são reaproveitadas e as alteradas
+        que já estavam em uso são lidas antes do retorno, para que a troca do
+        mapeamento entregue categorias completas.
+        """
+        entries = self.build_index(current.entries.values())
+        if entries == current.entries:
+            return None
+
+        categories = LazyCategories(self, entries, current.on_load)
+        for nome, entry in entries.items():
+            if not current.is_loaded(nome):
+                continue
+            if current.entries.get(nome) == entry:
+                categories._loaded[nome] = current[nome]
+            else:
+                categories.get(nome)
+        return categories
+
+    def build_index(
+        self, previous: Optional[Iterable[CategoryIndexEntry]] = None
+    ) -> Dict[str, CategoryIndexEntry]:
+        """Índice atual do diretório, reaproveitando entradas não alteradas.
+
+        ``previous`` são as entradas conhecidas; por padrão, as do índice salvo.
+        """
+        if not self._ensure_directory_exists():
+            return {}
+
+        json_files = sorted(self.examples_dir.glob("*.json"))
+        if not json_files:
+            print(f"⚠️  Nenhum arquivo de exemplo encontrado em {self.examples_dir}")
+            return {}
+
+        if previous is None:
+            corpus = self._get_corpus()
+            previous = self._read_index()
+            if corpus is not None:
+                previous = list(corpus.entries()) + previous
+        previous = {entry.path: entry for entry in previous}
+        entries: List[CategoryIndexEntry] = []
+        for file_path in json_files:
+            try:
+                stat = file_path.stat()
+            except FileNotFoundError:
+                continue  # removido durante a listagem
+            path = str(file_path)
+            version = (stat.st_mtime, stat.st_size)
+            entry = previous.get(path)
+            if (
+                entry is None or (entry.mtime, entry.size) != version
+            ) and self._failed.get(path) != version:
+                indexed = self._index_file(file_path, *version)
+                if indexed is None:
+                    self._failed[path] = version
+                else:
+                    self._failed.pop(path, None)
+                # Arquivo inválido (ex.: salvo pela metade) mantém a versão anterior
+                entry = indexed or entry
+            if entry is not None:
+                entries.append(entry)
+
+        if {entry.path: entry for entry in entries} != previous:
+            self._write_index(entries)
+        return {entry.nome: entry for entry in entries}
+
+    def load_category(self, entry: CategoryIndexEntry) -> Optional[Category]:
+        corpus = self._get_corpus()
+        if corpus is not None:
+            category = corpus.load(entry)
+            if category is not None:
+                return category
+        return self._load_category_from_file(Path(entry.path))
+
+    def compile_corpus(self, corpus_path: Optional[Path] = None) -> int:
+        """Lê todos os JSON e grava o corpus binário; retorna o total gravado"""
+        corpus_path = Path(corpus_path or self.corpus_path)
+        items = []
+        for entry in self.build_index(previous=[]).values():
+            category = self._load_category_from_file(Path(entry.path))
+            if category is not None:
+                items.append((entry, category))
+        return CategoryCorpus.write(corpus_path, items)
+
+    def _get_corpus(self) -> Optional[CategoryCorpus]:
+        if not self._corpus_checked:
+            self._corpus_checked = True
+            if self.corpus_path is not None:
+                self._corpus = CategoryCorpus.open(self.corpus_path)
+        return self._corpus
 
     def load_all_categories(self) -> Dict[str, Category]:
         """Carrega todas as categorias disponíveis"""
@@ -30,6 +228,56 @@ class CategoryLoader:
 
         return categories
 
+    def _index_file(
+        self, file_path: Path, mtime: float, size: int
+    ) -> Optional[CategoryIndexEntry]:
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError) as e:
+            print(f"❌ Erro ao indexar {file_path}: {e}")
+            return None
+
+        nome = data.get("categoria", file_path.stem)
+        return CategoryIndexEntry(
+            nome=nome,
+            path=str(file_path),
+            descricao=data.get("descricao", f"Prompts de {nome}"),
+            num_exemplos=len(data.get("exemplos", [])),
+            mtime=mtime,
+            size=size,
+            regras=tuple(data.get("metricas_qualidade", {}).get("regras", {})),
+        )
+
+    def _read_index(self) -> List[CategoryIndexEntry]:
+        if self.index_path is None or not self.index_path.exists():
+            return []
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != self.INDEX_VERSION:
+                return []
+            # regras volta do JSON como lista
+            return [
+                CategoryIndexEntry(*fields[:-1], tuple(fields[-1]))
+                for fields in data["entries"]
+            ]
+        except (json.JSONDecodeError, KeyError, TypeError):
+            return []
+
+    def _write_index(self, entries: List[CategoryIndexEntry]) -> None:
+        if self.index_path is None:
+            return
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_name(self.index_path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"version": self.INDEX_VERSION, "entries": entries},
+                f,
+                ensure_ascii=False,
+            )
+        tmp_path.replace(self.index_path)
+
     def _ensure_directory_exists(self) -> bool:
         """Garante que o diretório existe"""
         if not self.examples_dir.exists():
@@ -63,6 +311,7 @@ class CategoryLoader:
                 exemplos=examples,
                 diretrizes_especificas=data.get("diretrizes_especificas", []),
                 metricas_qualidade=data.get("metricas_qualidade", {}),
+                campos_perfil=data.get("campos_perfil", []),
             )
 
             print(
@@ -0,0 +1,102 @@
+import statistics
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+
+class AIMDController:
+    """Limite adaptativo de requisições simultâneas (AIMD).
+
+    Começa em ``slow start`` (+1 por sucesso, dobrando o limite a cada rodada)
+    e, após a primeira redução, cresce de forma aditiva (+1 por rodada de
+    ``limit`` sucessos). Erros ou latências acima de ``latency_tolerance`` vezes
+    a latência de referência reduzem o limite multiplicativamente, no máximo
+    uma vez por intervalo de latência, para que uma rajada de respostas lentas
+    não derrube o limite até o mínimo.
+
+    Como o tamanho das respostas varia muito, ``record`` aceita ``work`` (por
+    exemplo, palavras geradas) e compara a latência por unidade de trabalho. A
+    referência é o percentil ``baseline_percentile`` dessas latências nas
+    últimas ``window`` requisições: algumas respostas atípicas (como acertos
+    de cache) não a deslocam, e ela acompanha mudanças duradouras.
+    """
+
+    def __init__(
+        self,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        initial_limit: Optional[int] = None,
+        decrease_factor: float = 0.7,
+        latency_tolerance: float = 2.0,
+        window: int = 200,
+        baseline_percentile: float = 0.1,
+    ):
+        if not 1 <= min_limit <= max_limit:
+            raise ValueError("Os limites devem satisfazer 1 <= min_limit <= max_limit")
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.baseline_percentile = baseline_percentile
+        self._limit = float(initial_limit or min_limit)
+        self._slow_start = True
+        self._samples: deque = deque(maxlen=window)
+        self._latencies: deque = deque(maxlen=window)
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def limit(self) -> int:
+        """Número atual de requisições simultâneas permitidas"""
+        return int(self._limit)
+
+    @property
+    def baseline_latency(self) -> float:
+        """Latência de referência por unidade de trabalho"""
+        return self._percentile(self._samples)
+
+    def record(
+        self, latency: float, success: bool, work: Optional[float] = None
+    ) -> None:
+        """Registra o resultado de uma requisição e ajusta o limite.
+
+        ``work`` é o tamanho da resposta (ex.: palavras geradas); sem ele a
+        latência é comparada por requisição.
+        """
+        with self._lock:
+            if success:
+                normalized = latency / max(work or 1.0, 1.0)
+                congested = (
+                    bool(self._samples)
+                    and normalized > self.baseline_latency * self.latency_tolerance
+                )
+                self._samples.append(normalized)
+                self._latencies.append(latency)
+            else:
+                congested = True
+
+            if congested:
+                self._decrease()
+            elif self._slow_start:
+                self._limit += 1
+            else:
+                self._limit += 1 / self._limit
+
+            self._limit = min(max(self._limit, self.min_limit), self.max_limit)
+
+    def _percentile(self, values: deque) -> float:
+        if not values:
+            return 0.0
+        ordered = sorted(values)
+        return ordered[int((len(ordered) - 1) * self.baseline_percentile)]
+
+    def _decrease(self) -> None:
+        # No máximo uma redução por requisição típica (mediana da janela)
+        now = time.monotonic()
+        typical = statistics.median(self._latencies) if self._latencies else 0.0
+        if now - self._last_decrease < typical:
+            return
+        self._last_decrease = now
+        self._slow_start = False
+        self._limit *= self.decrease_factor
@@ -0,0 +1,255 @@
+import contextlib
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List
+
+from models.job import PlannedJob
+
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+
+@dataclass(frozen=True)
+class Lease:
+    """Um job emprestado a um worker até ``expires_at``"""
+
+    job: PlannedJob
+    lease_id: str
+    expires_at: float
+
+
+class JobQueue:
+    """Fila de jobs (categoria, seed) em SQLite, compartilhável entre máquinas.
+
+    Workers pegam jobs com ``lease``; um job emprestado volta a ficar
+    disponível se o empréstimo expirar sem ``complete`` (worker caiu ou
+    travou). ``complete`` só é aceito para o empréstimo vigente, então cada job
+    tem exatamente um resultado registrado, mesmo que um worker lento termine
+    depois de o job ter sido repassado a outro.
+
+    Em sistemas de arquivos de rede o SQLite não suporta WAL; por isso a fila
+    usa o journal padrão e transações curtas com ``BEGIN IMMEDIATE``.
+    """
+
+    def __init__(self, path: Path, lease_seconds: float = 600.0, max_attempts: int = 3):
+        self.path = Path(path)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(self.path), timeout=30.0, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_index INTEGER PRIMARY KEY,
+                category TEXT NOT NULL,
+                seed INTEGER,
+                state TEXT NOT NULL DEFAULT 'pending',
+                lease_id TEXT,
+                worker TEXT,
+                lease_expires REAL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                result TEXT,
+                error TEXT,
+                completed_at REAL
+            )
+            """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_jobs_state ON jobs (state, job_index)"
+        )
+
+    def enqueue(self, jobs: Iterable[PlannedJob]) -> List[PlannedJob]:
+        """Adiciona um lote de jobs à fila e retorna os jobs como enfileirados.
+
+        Os índices do lote são deslocados para depois do maior índice já
+        existente, preservando a ordem e as seeds, então lotes enfileirados em
+        sequência nunca colidem. Índices repetidos no próprio lote geram
+        ``ValueError`` e nada é enfileirado.
+        """
+        jobs = list(jobs)
+        if not jobs:
+            return []
+        with self._lock, self._transaction():
+            (max_index,) = self._conn.execute(
+                "SELECT MAX(job_index) FROM jobs"
+            ).fetchone()
+            offset = (-1 if max_index is None else max_index) + 1
+            offset -= min(job.index for job in jobs)
+            queued = [
+                PlannedJob(offset + job.index, job.category, job.seed) for job in jobs
+            ]
+            cursor = self._conn.executemany(
+                "INSERT OR IGNORE INTO jobs (job_index, category, seed) "
+                "VALUES (?, ?, ?)",
+                ((job.index, job.category, job.seed) for job in queued),
+            )
+            collisions = len(queued) - cursor.rowcount
+            if collisions:
+                raise ValueError(
+                    f"{collisions} job(s) com índice repetido no lote; "
+                    "nenhum job foi enfileirado"
+                )
+        return queued
+
+    def lease(self, worker: str, count: int = 1) -> List[Lease]:
+        """Empresta até ``count`` jobs pendentes ou com empréstimo expirado.
+
+        Um empréstimo que expira já na ``max_attempts``-ésima tentativa marca
+        o job como falho: o worker que morre processando-o nunca chama
+        ``fail``, e o job não deve derrubar workers indefinidamente.
+        """
+        now = time.time()
+        expires_at = now + self.lease_seconds
+        with self._lock, self._transaction():
+            self._conn.execute(
+                """
+                UPDATE jobs SET state = ?, lease_id = NULL, lease_expires = NULL,
+                    error = ?
+                WHERE state = ? AND lease_expires < ? AND attempts >= ?
+                """,
+                (
+                    FAILED,
+                    f"empréstimo expirou em {self.max_attempts} tentativas",
+                    LEASED,
+                    now,
+                    self.max_attempts,
+                ),
+            )
+            rows = self._conn.execute(
+                """
+                SELECT job_index, category, seed FROM jobs
+                WHERE state = ? OR (state = ? AND lease_expires < ?)
+                ORDER BY job_index
+                LIMIT ?
+                """,
+                (PENDING, LEASED, now, count),
+            ).fetchall()
+
+            leases = []
+            for job_index, category, seed in rows:
+                lease_id = uuid.uuid4().hex
+                self._conn.execute(
+                    """
+                    UPDATE jobs SET state = ?, lease_id = ?, worker = ?,
+                        lease_expires = ?, attempts = attempts + 1
+                    WHERE job_index = ?
+                    """,
+                    (LEASED, lease_id, worker, expires_at, job_index),
+                )
+                leases.append(
+                    Lease(PlannedJob(job_index, category, seed), lease_id, expires_at)
+                )
+            return leases
+
+    def renew(self, lease: Lease) -> bool:
+        """Prolonga um empréstimo ainda vigente"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET lease_expires = ? "
+                "WHERE job_index = ? AND lease_id = ? AND state = ?",
+                (
+                    time.time() + self.lease_seconds,
+                    lease.job.index,
+                    lease.lease_id,
+                    LEASED,
+                ),
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, lease: Lease, result: Dict[str, Any]) -> bool:
+        """Registra o resultado; False se o empréstimo não é mais deste worker"""
+        with self._lock:
+            cursor = self._conn.execute(
+                """
+                UPDATE jobs SET state = ?, result = ?, completed_at = ?,
+                    lease_expires = NULL
+                WHERE job_index = ? AND lease_id = ? AND state = ?
+                """,
+                (
+                    DONE,
+                    json.dumps(result, ensure_ascii=False),
+                    time.time(),
+                    lease.job.index,
+                    lease.lease_id,
+                    LEASED,
+                ),
+            )
+            return cursor.rowcount == 1
+
+    def fail(self, lease: Lease, error: str) -> None:
+        """Devolve o job à fila, ou o marca como falho após ``max_attempts``"""
+        with self._lock:
+            self._conn.execute(
+                """
+                UPDATE jobs SET
+                    state = CASE WHEN attempts >= ? THEN ? ELSE ? END,
+                    error = ?, lease_id = NULL, lease_expires = NULL
+                WHERE job_index = ? AND lease_id = ? AND state = ?
+                """,
+                (
+                    self.max_attempts,
+                    FAILED,
+                    PENDING,
+                    error,
+                    lease.job.index,
+                    lease.lease_id,
+                    LEASED,
+                ),
+            )
+
+    def is_drained(self) -> bool:
+        """True quando não há jobs pendentes nem emprestados"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE state IN (?, ?)", (PENDING, LEASED)
+            ).fetchone()
+        return row[0] == 0
+
+    def iter_results(self, page_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """Resultados concluídos, na ordem dos jobs, lidos em páginas"""
+        last_index = -1
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT job_index, result FROM jobs "
+                    "WHERE state = ? AND job_index > ? ORDER BY job_index LIMIT ?",
+                    (DONE, last_index, page_size),
+                ).fetchall()
+            if not rows:
+                return
+            for last_index, result in rows:
+                yield json.loads(result)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT state, COUNT(*) FROM jobs GROUP BY state"
+            ).fetchall()
+        counts = {PENDING: 0, LEASED: 0, DONE: 0, FAILED: 0}
+        counts.update(dict(rows))
+        return counts
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    @contextlib.contextmanager
+    def _transaction(self) -> Iterator[None]:
+        # IMMEDIATE reserva a escrita já no início: dois workers nunca
+        # selecionam o mesmo job
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
@@ -1,5 +1,16 @@
-import ollama
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
 from config.settings import LLMConfig
+from services.text_processor import StreamingCleaner
+
+if TYPE_CHECKING:
+    import ollama
+
+# ollama (e sua pilha HTTP), o pool de hosts e o cache SQLite são importados só
+# quando usados: importar este módulo deve ser barato
+
+SYSTEM_MESSAGE = "Você é um especialista em RH focado em criar prompts de alta qualidade. Sempre responda de forma precisa, detalhada e profissional."
 
 
 class LLMService:
@@ -7,31 +18,252 @@ class LLMService:
 
     def __init__(self, config: LLMConfig):
         self.config = config
+        self._async_client = None
+        self._async_loop = None
+        self.cache = None
+        if config.cache_enabled:
+            from services.response_cache import ResponseCache
 
-    def generate_response(self, prompt: str) -> str:
-        """Gera resposta usando o modelo LLM"""
-        try:
-            response = ollama.chat(
-                model=self.config.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "Você é um especialista em RH focado em criar prompts de alta qualidade. Sempre responda de forma precisa, detalhada e profissional.",
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt,
-                    },
-                ],
-                options={
-                    "temperature": self.config.temperature,
-                    "top_p": self.config.top_p,
-                    "top_k": self.config.top_k,
-                    "repeat_penalty": self.config.repeat_penalty,
-                    "num_predict": self.config.num_predict,
-                    "stop": self.config.stop_tokens,
-                },
+            self.cache = ResponseCache(
+                config.cache_path,
+                max_entries=config.cache_max_entries,
+                max_age_seconds=config.cache_max_age_seconds,
+            )
+        self.backend_pool = None
+        if config.hosts:
+            from services.backend_pool import BackendPool
+
+            self.backend_pool = BackendPool(
+                config.hosts,
+                health_check_interval=config.health_check_interval,
+                failure_threshold=config.host_failure_threshold,
+            )
+            self.backend_pool.start_health_checks()
+
+    def generate_response(
+        self,
+        prompt: str,
+        seed: Optional[int] = None,
+        use_cache: bool = True,
+        stream: Optional[bool] = None,
+        max_words: Optional[int] = None,
+    ) -> str:
+        """Gera resposta usando o modelo LLM.
+
+        Com ``stream`` (padrão: ``config.stream``) a resposta é lida aos poucos e
+        a requisição é cancelada ao surgir um marcador de sufixo ou ao passar de
+        ``max_words`` palavras.
+        """
+        stream = self.config.stream if stream is None else stream
+        options = self._build_options(seed)
+        cache_key = self._get_cache_key(prompt, options, use_cache, stream, max_words)
+        if cache_key:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        try:
+            content = self._chat(
+                self._build_messages(prompt), options, stream, max_words
             )
-            return response["message"]["content"]
         except Exception as e:
             raise RuntimeError(f"Erro ao gerar resposta do LLM: {e}")
+
+        if cache_key:
+            self.cache.put(cache_key, content)
+        return content
+
+    async def agenerate_response(
+        self,
+        prompt: str,
+        seed: Optional[int] = None,
+        use_cache: bool = True,
+        stream: Optional[bool] = None,
+        max_words: Optional[int] = None,
+    ) -> str:
+        """Gera resposta de forma assíncrona usando o modelo LLM"""
+        stream = self.config.stream if stream is None else stream
+        options = self._build_options(seed)
+        cache_key = self._get_cache_key(prompt, options, use_cache, stream, max_words)
+        if cache_key:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        try:
+            content = await self._achat(
+                self._build_messages(prompt), options, stream, max_words
+            )
+        except Exception as e:
+            raise RuntimeError(f"Erro ao gerar resposta do LLM: {e}")
+
+        if cache_key:
+            self.cache.put(cache_key, content)
+        return content
+
+    def _chat(
+        self,
+        messages: List[Dict[str, str]],
+        options: Dict[str, Any],
+        stream: bool = False,
+        max_words: Optional[int] = None,
+    ) -> str:
+        if self.backend_pool is None:
+            import ollama
+
+            return self._complete(ollama.chat, messages, options, stream, max_words)
+
+        # Uma requisição que falha é repetida uma vez em outro host
+        backend = self.backend_pool.acquire()
+        try:
+            return self._chat_on(backend, messages, options, stream, max_words)
+        except Exception:
+            backend = self.backend_pool.acquire_other(backend)
+            if backend is None:
+                raise
+            return self._chat_on(backend, messages, options, stream, max_words)
+
+    def _chat_on(self, backend, messages, options, stream, max_words) -> str:
+        start = time.perf_counter()
+        success = False
+        try:
+            content = self._complete(
+                backend.client.chat, messages, options, stream, max_words
+            )
+            success = True
+            return content
+        finally:
+            self.backend_pool.release(backend, time.perf_counter() - start, success)
+
+    async def _achat(
+        self,
+        messages: List[Dict[str, str]],
+        options: Dict[str, Any],
+        stream: bool = False,
+        max_words: Optional[int] = None,
+    ) -> str:
+        if self.backend_pool is None:
+            return await self._acomplete(
+                self._get_async_client().chat, messages, options, stream, max_words
+            )
+
+        backend = self.backend_pool.acquire()
+        try:
+            return await self._achat_on(backend, messages, options, stream, max_words)
+        except Exception:
+            backend = self.backend_pool.acquire_other(backend)
+            if backend is None:
+                raise
+            return await self._achat_on(backend, messages, options, stream, max_words)
+
+    async def _achat_on(self, backend, messages, options, stream, max_words) -> str:
+        start = time.perf_counter()
+        success = False
+        try:
+            content = await self._acomplete(
+                backend.get_async_client().chat, messages, options, stream, max_words
+            )
+            success = True
+            return content
+        finally:
+            self.backend_pool.release(backend, time.perf_counter() - start, success)
+
+    def _complete(self, chat, messages, options, stream, max_words) -> str:
+        response = chat(
+            model=self.config.model,
+            messages=messages,
+            options=options,
+            keep_alive=self.config.keep_alive,
+            stream=stream,
+        )
+        if not stream:
+            return response["message"]["content"]
+
+        cleaner = StreamingCleaner(max_words)
+        try:
+            for chunk in response:
+                if cleaner.feed(chunk["message"]["content"]):
+                    break
+        finally:
+            # Fechar o gerador fecha a conexão, e o Ollama cancela a geração
+            response.close()
+        return cleaner.text
+
+    async def _acomplete(self, chat, messages, options, stream, max_words) -> str:
+        response = await chat(
+            model=self.config.model,
+            messages=messages,
+            options=options,
+            keep_alive=self.config.keep_alive,
+            stream=stream,
+        )
+        if not stream:
+            return response["message"]["content"]
+
+        cleaner = StreamingCleaner(max_words)
+        try:
+            async for chunk in response:
+                if cleaner.feed(chunk["message"]["content"]):
+                    break
+        finally:
+            await response.aclose()
+        return cleaner.text
+
+    def close(self) -> None:
+        if self.backend_pool is not None:
+            self.backend_pool.close()
+        if self.cache is not None:
+            self.cache.close()
+
+    def _get_cache_key(
+        self,
+        prompt: str,
+        options: Dict[str, Any],
+        use_cache: bool,
+        stream: bool = False,
+        max_words: Optional[int] = None,
+    ) -> Optional[str]:
+        if self.cache is None or not use_cache:
+            return None
+        if stream and max_words is not None:
+            # Respostas cortadas pelo limite de palavras não servem para outro limite
+            options = dict(options, max_words=max_words)
+        return self.cache.make_key(self.config.model, options, SYSTEM_MESSAGE, prompt)
+
+    def _get_async_client(self) -> "ollama.AsyncClient":
+        """Retorna o cliente assíncrono do event loop atual"""
+        import asyncio
+
+        import ollama
+
+        # O cliente HTTP assíncrono fica preso ao loop em que foi criado
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_loop is not loop:
+            self._async_client = ollama.AsyncClient()
+            self._async_loop = loop
+        return self._async_client
+
+    def _build_messages(self, prompt: str) -> List[Dict[str, str]]:
+        return [
+            {
+                "role": "system",
+                "content": SYSTEM_MESSAGE,
+            },
+            {
+                "role": "user",
+                "content": prompt,
+            },
+        ]
+
+    def _build_options(self, seed: Optional[int] = None) -> Dict[str, Any]:
+        options = {
+            "temperature": self.config.temperature,
+            "top_p": self.config.top_p,
+            "top_k": self.config.top_k,
+            "repeat_penalty": self.config.repeat_penalty,
+            "num_predict": self.config.num_predict,
+            "stop": self.config.stop_tokens,
+        }
+        if seed is not None:
+            options["seed"] = seed
+        return options
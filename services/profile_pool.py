@@ -0,0 +1,93 @@
+import threading
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+
+class ProfilePool:
+    """Mantém perfis de PII pré-gerados, reabastecidos em segundo plano.
+
+    Quando o pool cai abaixo de ``low_watermark`` o produtor volta a gerar
+    perfis até atingir ``high_watermark``. Consumidores nunca esperam pelo
+    produtor: se faltarem perfis prontos, o restante é gerado na hora. Um erro
+    da ``factory`` no produtor é registrado e a geração é retomada após
+    ``retry_delay`` segundos.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Dict],
+        low_watermark: int = 16,
+        high_watermark: int = 64,
+        retry_delay: float = 1.0,
+    ):
+        if not 0 <= low_watermark < high_watermark:
+            raise ValueError(
+                "Os limites do pool devem satisfazer 0 <= low_watermark < high_watermark"
+            )
+        self.factory = factory
+        self.low_watermark = low_watermark
+        self.high_watermark = high_watermark
+        self.retry_delay = retry_delay
+        self._profiles: deque = deque()
+        self._condition = threading.Condition()
+        self._closed = False
+        self._producer: Optional[threading.Thread] = None
+
+    def __len__(self) -> int:
+        return len(self._profiles)
+
+    def start(self) -> None:
+        """Inicia o produtor em segundo plano (idempotente)"""
+        with self._condition:
+            if self._producer is not None or self._closed:
+                return
+            self._producer = threading.Thread(
+                target=self._produce, name="profile-pool", daemon=True
+            )
+            self._producer.start()
+
+    def close(self) -> None:
+        """Encerra o produtor e descarta os perfis restantes"""
+        with self._condition:
+            self._closed = True
+            self._profiles.clear()
+            self._condition.notify_all()
+        if self._producer is not None:
+            self._producer.join()
+
+    def take(self, count: int) -> List[Dict]:
+        """Retira ``count`` perfis do pool, gerando na hora os que faltarem"""
+        self.start()
+        profiles = []
+        with self._condition:
+            while self._profiles and len(profiles) < count:
+                profiles.append(self._profiles.popleft())
+            if len(self._profiles) < self.low_watermark:
+                self._condition.notify()
+
+        while len(profiles) < count:
+            profiles.append(self.factory())
+        return profiles
+
+    def _produce(self) -> None:
+        while True:
+            with self._condition:
+                while not self._closed and len(self._profiles) >= self.low_watermark:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                missing = self.high_watermark - len(self._profiles)
+
+            for _ in range(missing):
+                try:
+                    profile = self.factory()
+                except Exception as e:
+                    print(f"❌ Erro ao pré-gerar perfil: {e}")
+                    # Espera antes de tentar de novo, sem deixar de atender close()
+                    with self._condition:
+                        self._condition.wait_for(lambda: self._closed, self.retry_delay)
+                    break
+                with self._condition:
+                    if self._closed:
+                        return
+                    self._profiles.append(profile)
@@ -1,65 +1,265 @@
-from typing import List
+import random
+from dataclasses import replace
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
 from models.category import Category
-from pii_generator import PIIGenerator
+from utils.token_counter import estimate_tokens, truncate_to_tokens
+
+EXAMPLE_SEPARATOR = "=" * 60
+
+# Campos mantidos na serialização compacta dos perfis. Categorias que usam
+# outros dados (endereço, cartão, processo...) os declaram em "campos_perfil".
+DEFAULT_PROFILE_FIELDS = ("name", "cpf", "job", "email", "phone")
+
+
+class CategoryTemplate(NamedTuple):
+    """Trechos estáticos do prompt de uma categoria, renderizados uma vez"""
+
+    category: Category
+    head: str
+    middle: str
+    tail: str
+    static_tokens: int
+    # Partes usadas pelo layout "prefix_stable"
+    mission: str
+    profiles_header: str
+    closing: str
+
+
+PROMPT_LAYOUTS = ("classic", "prefix_stable")
 
 
 class PromptBuilder:
-    """Responsável por construir prompts especializados"""
+    """Responsável por construir prompts especializados.
+
+    No layout "classic" os exemplos sorteados e os perfis ficam no meio do
+    prompt. No layout "prefix_stable" tudo o que é fixo por categoria
+    (cabeçalho, um conjunto fixo de exemplos, missão e diretrizes) vem antes
+    dos perfis, de modo que prompts consecutivos da mesma categoria
+    compartilham um prefixo idêntico e o servidor pode reaproveitar o cache KV.
+    """
+
+    def __init__(
+        self,
+        stratify_by: Sequence[str] = (),
+        compact_profiles: bool = False,
+        profile_fields: Sequence[str] = DEFAULT_PROFILE_FIELDS,
+        token_budget: Optional[int] = None,
+        layout: str = "classic",
+    ):
+        if layout not in PROMPT_LAYOUTS:
+            raise ValueError(
+                f"Layout de prompt inválido '{layout}'. Opções: {', '.join(PROMPT_LAYOUTS)}"
+            )
+        self.stratify_by = tuple(stratify_by)
+        self.compact_profiles = compact_profiles
+        self.profile_fields = tuple(profile_fields)
+        self.token_budget = token_budget
+        self.layout = layout
+        self._templates: Dict[str, CategoryTemplate] = {}
+        self._prefixes: Dict[Tuple[str, int], Tuple[Category, str]] = {}
 
-    def __init__(self):
-        self.pii_factory = PIIGenerator()
+    def prepare(self, categories: Iterable[Category]) -> None:
+        """Renderiza antecipadamente os trechos estáticos de cada categoria"""
+        for category in categories:
+            self._templates[category.nome] = self._build_template(category)
 
     def build_specialized_prompt(
-        self, category: Category, profiles: List, num_examples: int = 3
+        self,
+        category: Category,
+        profiles: List,
+        num_examples: int = 3,
+        rng: Optional[random.Random] = None,
     ) -> str:
         """Constrói um prompt especializado para a categoria"""
-        examples = category.get_random_examples(num_examples)
+        if self.layout == "prefix_stable":
+            return self._build_prefix_stable_prompt(category, profiles, num_examples)
+
+        examples = category.get_random_examples(
+            num_examples, rng=rng, stratify_by=self.stratify_by
+        )
 
         if not examples:
             raise ValueError(
                 f"Nenhum exemplo disponível para categoria '{category.nome}'"
             )
 
-        examples_text = self._format_examples(examples, category.nome)
-        guidelines_text = self._format_guidelines(category)
+        template = self._get_template(category)
+        profiles_text = self._format_profiles(
+            profiles, category.campos_perfil or self.profile_fields
+        )
+        if self.token_budget is None:
+            examples_text = self._format_examples(examples, category.nome)
+        else:
+            examples_text = self._fit_examples(
+                examples,
+                category.nome,
+                self.token_budget
+                - template.static_tokens
+                - estimate_tokens(profiles_text),
+            )
+
+        return "".join(
+            [
+                template.head,
+                examples_text,
+                template.middle,
+                profiles_text,
+                template.tail,
+            ]
+        )
+
+    def _build_prefix_stable_prompt(
+        self, category: Category, profiles: List, num_examples: int
+    ) -> str:
+        template = self._get_template(category)
+        profiles_text = self._format_profiles(
+            profiles, category.campos_perfil or self.profile_fields
+        )
+        return "".join(
+            [
+                self._get_stable_prefix(category, num_examples),
+                template.profiles_header,
+                profiles_text,
+                template.closing,
+            ]
+        )
+
+    def _get_stable_prefix(self, category: Category, num_examples: int) -> str:
+        """Prefixo fixo da categoria: cabeçalho, exemplos fixos, missão e diretrizes.
+
+        Os exemplos são os primeiros ``num_examples`` do arquivo, sem sorteio.
+        Com orçamento de tokens, eles são ajustados ao orçamento descontadas só
+        as partes fixas, para que o prefixo não dependa dos perfis.
+        """
+        key = (category.nome, num_examples)
+        cached = self._prefixes.get(key)
+        if cached is not None and cached[0] is category:
+            return cached[1]
 
-        prompt = f"""
+        examples = category.exemplos[:num_examples]
+        if not examples:
+            raise ValueError(
+                f"Nenhum exemplo disponível para categoria '{category.nome}'"
+            )
+
+        template = self._get_template(category)
+        if self.token_budget is None:
+            examples_text = self._format_examples(examples, category.nome)
+        else:
+            examples_text = self._fit_examples(
+                examples, category.nome, self.token_budget - template.static_tokens
+            )
+
+        prefix = template.head + examples_text + template.mission
+        self._prefixes[key] = (category, prefix)
+        return prefix
+
+    def _get_template(self, category: Category) -> CategoryTemplate:
+        template = self._templates.get(category.nome)
+        # Uma categoria recarregada é outro objeto: o trecho é refeito
+        if template is None or template.category is not category:
+            template = self._build_template(category)
+            self._templates[category.nome] = template
+        return template
+
+    def _build_template(self, category: Category) -> CategoryTemplate:
+        head = f"""
 Você é um especialista sênior em Recursos Humanos, especializado em {category.descricao.lower()}.
 
 CATEGORIA FOCO: {category.nome.upper()}
 EXPERTISE: {category.descricao}
 
 EXEMPLOS DE REFERÊNCIA DE ALTA QUALIDADE:
-{examples_text}
-
-PERFIS FICTÍCIOS DISPONÍVEIS:
-{[str(p) for p in profiles]}
+"""
+        profiles_header = """PERFIS FICTÍCIOS DISPONÍVEIS:
+"""
+        middle = "\n\n" + profiles_header
+        mission = f"""
 
 MISSÃO:
 Crie UM prompt profissional e detalhado da categoria {category.nome.upper()}, seguindo exatamente o padrão dos exemplos acima.
 
-{guidelines_text}
+{self._format_guidelines(category)}
+
+"""
+        closing = """
 
 IMPORTANTE: Responda APENAS com o texto do prompt final, sem comentários adicionais.
 """
-        return prompt
+        tail = mission[: -len("\n\n")] + closing
+        static_tokens = estimate_tokens(head + middle + tail)
+        return CategoryTemplate(
+            category,
+            head,
+            middle,
+            tail,
+            static_tokens,
+            mission,
+            profiles_header,
+            closing,
+        )
+
+    def _format_profiles(self, profiles: List, fields: Sequence[str]) -> str:
+        """Serializa os perfis: repr da lista ou linhas "campo: valor" compactas"""
+        if not self.compact_profiles:
+            return str([str(p) for p in profiles])
+
+        blocks = []
+        for i, profile in enumerate(profiles, 1):
+            lines = [f"PERFIL {i}"]
+            lines.extend(
+                f"{field}: {profile[field]}" for field in fields if profile.get(field)
+            )
+            blocks.append("\n".join(lines))
+        return "\n\n".join(blocks)
+
+    def _fit_examples(
+        self, examples: List, category_name: str, available_tokens: int
+    ) -> str:
+        """Escolhe, na ordem sorteada, os exemplos que cabem no orçamento.
+
+        Se nenhum couber inteiro, o mais curto é truncado para caber.
+        """
+        selected = []
+        used = 0
+        for ex in examples:
+            cost = estimate_tokens(self._format_examples([ex], category_name))
+            if used + cost <= available_tokens:
+                selected.append(ex)
+                used += cost
+
+        if selected:
+            return self._format_examples(selected, category_name)
+
+        shortest = min(examples, key=lambda ex: len(ex.prompt))
+        overhead = estimate_tokens(
+            self._format_examples([replace(shortest, prompt="")], category_name)
+        )
+        truncated = replace(
+            shortest,
+            prompt=truncate_to_tokens(
+                shortest.prompt, max(available_tokens - overhead, 1)
+            ),
+        )
+        return self._format_examples([truncated], category_name)
 
     def _format_examples(self, examples: List, category_name: str) -> str:
         """Formata exemplos para o prompt"""
-        examples_text = ""
+        category_upper = category_name.upper()
+        parts = []
         for i, ex in enumerate(examples, 1):
-            examples_text += f"\n{'='*60}\n"
-            examples_text += (
-                f"EXEMPLO {i} - {category_name.upper()} ({ex.subcategoria})\n"
+            parts.append(
+                f"\n{EXAMPLE_SEPARATOR}\n"
+                f"EXEMPLO {i} - {category_upper} ({ex.subcategoria})\n"
+                f"Complexidade: {ex.complexidade}\n"
+                f"{EXAMPLE_SEPARATOR}\n"
+                f'"{ex.prompt}"\n'
             )
-            examples_text += f"Complexidade: {ex.complexidade}\n"
-            examples_text += f"{'='*60}\n"
-            examples_text += f'"{ex.prompt}"\n'
-        return examples_text
+        return "".join(parts)
 
     def _format_guidelines(self, category: Category) -> str:
         """Formata diretrizes específicas da categoria"""
-        guidelines_text = f"DIRETRIZES ESPECÍFICAS PARA {category.nome.upper()}:\n"
+        header = f"DIRETRIZES ESPECÍFICAS PARA {category.nome.upper()}:\n"
 
         # Diretrizes padrão
         default_guidelines = [
@@ -76,7 +276,4 @@ IMPORTANTE: Responda APENAS com o texto do prompt final, sem comentários adicio
         # Adiciona diretrizes específicas da categoria se existirem
         all_guidelines = default_guidelines + category.diretrizes_especificas
 
-        for guideline in all_guidelines:
-            guidelines_text += f"{guideline}\n"
-
-        return guidelines_text
+        return header + "".join(f"{guideline}\n" for guideline in all_guidelines)
@@ -0,0 +1,153 @@
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class QualityRule:
+    """Métrica booleana: o padrão aparece no texto?"""
+
+    name: str
+    pattern: "re.Pattern[str]"
+
+    def evaluate(self, texto: str) -> bool:
+        return self.pattern.search(texto) is not None
+
+
+@dataclass
+class CategoryRuleSet:
+    """Regras e limites de palavras compilados de uma categoria"""
+
+    rules: Tuple[QualityRule, ...] = ()
+    min_words: Optional[int] = None
+    max_words: Optional[int] = None
+
+    def evaluate(self, texto: str) -> Dict[str, bool]:
+        return {rule.name: rule.evaluate(texto) for rule in self.rules}
+
+    def merged_with(self, other: "CategoryRuleSet") -> "CategoryRuleSet":
+        """Combina dois conjuntos; regras e limites de ``other`` prevalecem"""
+        rules = {rule.name: rule for rule in self.rules}
+        rules.update({rule.name: rule for rule in other.rules})
+        return CategoryRuleSet(
+            rules=tuple(rules.values()),
+            min_words=(
+                other.min_words if other.min_words is not None else self.min_words
+            ),
+            max_words=(
+                other.max_words if other.max_words is not None else self.max_words
+            ),
+        )
+
+
+# Regras das categorias existentes. Novas categorias podem declarar as suas no
+# JSON, em "metricas_qualidade": {"regras": {"nome": "padrão" | {...}}}.
+DEFAULT_CATEGORY_RULES: Dict[str, Dict[str, Any]] = {
+    "suspensao": {
+        "min_palavras": 150,
+        "max_palavras": 600,
+        "regras": {
+            "has_evidence": {
+                "padrao": r"(evidência|testemunha|relatório|laudo)",
+                "ignorar_caixa": True,
+            },
+            "has_period": {
+                "padrao": r"(\d+\s*(dia|semana|mês))",
+                "ignorar_caixa": True,
+            },
+        },
+    },
+    "financeiro": {
+        "min_palavras": 200,
+        "max_palavras": 700,
+        "regras": {
+            "has_values": r"R\$\s*[\d.,]+",
+            "has_calculations": {
+                "padrao": r"(análise|cálculo|auditoria|crédito)",
+                "ignorar_caixa": True,
+            },
+        },
+    },
+    "avaliacao": {
+        "min_palavras": 100,
+        "max_palavras": 500,
+        "regras": {
+            "has_experience": {
+                "padrao": r"(experiência|formação|cargo|empresa)",
+                "ignorar_caixa": True,
+            },
+            "has_skills": {
+                "padrao": r"(competência|habilidade|certificação)",
+                "ignorar_caixa": True,
+            },
+        },
+    },
+    "comunicacao_interna": {
+        "min_palavras": 50,
+        "max_palavras": 300,
+        "regras": {
+            "mentions_date_time": r"\d{1,2}/\d{1,2}/\d{2,4}|\d{1,2}h",
+            "has_objective": {
+                "padrao": r"(objetivo|assunto|tema|propósito)",
+                "ignorar_caixa": True,
+            },
+        },
+    },
+    "demissao_desligamento": {
+        "min_palavras": 150,
+        "max_palavras": 600,
+        "regras": {
+            "has_rescision_terms": {
+                "padrao": r"(rescisão|rescisório|demissão|desligamento|aviso prévio)",
+                "ignorar_caixa": True,
+            },
+            "has_employment_data": {
+                "padrao": r"(matrícula|admissão|admitido|contratado|salário)",
+                "ignorar_caixa": True,
+            },
+            "has_legal_procedures": {
+                "padrao": r"(homologação|sindicato|CLT|FGTS|13º|férias)",
+                "ignorar_caixa": True,
+            },
+            "has_financial_calculations": r"R\$\s*[\d.,]+",
+        },
+    },
+}
+
+
+def compile_rule(name: str, spec: Any) -> QualityRule:
+    """Compila uma regra a partir de um padrão ou de {"padrao", "ignorar_caixa"}"""
+    if isinstance(spec, str):
+        return QualityRule(name, re.compile(spec))
+    if isinstance(spec, Mapping) and "padrao" in spec:
+        flags = re.IGNORECASE if spec.get("ignorar_caixa", False) else 0
+        return QualityRule(name, re.compile(spec["padrao"], flags))
+    raise ValueError(f"Regra de qualidade inválida '{name}': {spec!r}")
+
+
+def compile_rule_set(
+    metricas_qualidade: Optional[Mapping[str, Any]],
+) -> CategoryRuleSet:
+    """Compila as regras declaradas em ``metricas_qualidade`` de uma categoria.
+
+    Chaves desconhecidas (como ``requer_calculos``) são ignoradas.
+    """
+    if not metricas_qualidade:
+        return CategoryRuleSet()
+
+    rules = tuple(
+        compile_rule(name, spec)
+        for name, spec in (metricas_qualidade.get("regras") or {}).items()
+    )
+    return CategoryRuleSet(
+        rules=rules,
+        min_words=metricas_qualidade.get("min_palavras"),
+        max_words=metricas_qualidade.get("max_palavras"),
+    )
+
+
+def compile_default_rule_sets() -> Dict[str, CategoryRuleSet]:
+    return {
+        categoria: compile_rule_set(spec)
+        for categoria, spec in DEFAULT_CATEGORY_RULES.items()
+    }
@@ -1,5 +1,50 @@
 import re
-from typing import Tuple, Dict, Any
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Optional, Sequence, Tuple, Dict, Any, Union
+
+from models.category import Category
+from services.quality_rules import (
+    CategoryRuleSet,
+    compile_default_rule_sets,
+    compile_rule_set,
+)
+
+# Padrões compilados uma única vez, no import do módulo
+PREFIX_PATTERNS = [
+    re.compile(r"^(Prompt:|Texto:|Aqui está.*?:|Para.*?:)\s*", re.IGNORECASE)
+]
+# Marcadores a partir dos quais clean_response descarta o restante do texto
+SUFFIX_MARKERS = ("---", "EXEMPLO", "NOTA:", "OBSERVAÇÃO:", "Espero", "Fico", "Aguardo")
+_SUFFIX_MARKER_ALTERNATION = "|".join(re.escape(marker) for marker in SUFFIX_MARKERS)
+SUFFIX_PATTERNS = [
+    re.compile(
+        rf"\s*((?:{_SUFFIX_MARKER_ALTERNATION}).*)$",
+        re.IGNORECASE | re.DOTALL,
+    )
+]
+SUFFIX_MARKER_PATTERN = re.compile(_SUFFIX_MARKER_ALTERNATION, re.IGNORECASE)
+MAX_MARKER_LENGTH = max(len(marker) for marker in SUFFIX_MARKERS)
+WORD_PATTERN = re.compile(r"\S+")
+# Métricas booleanas calculadas para todas as categorias
+BASE_BOOLEAN_METRICS = (
+    "has_cpf",
+    "has_names",
+    "has_emails",
+    "has_phones",
+    "has_specific_data",
+    "ideal_length",
+)
+
+CPF_PATTERN = re.compile(r"\d{3}\.?\d{3}\.?\d{3}-?\d{2}")
+NAME_PATTERN = re.compile(r"[A-Z][a-z]+\s+[A-Z][a-z]+")
+EMAIL_PATTERN = re.compile(r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+")
+PHONE_PATTERN = re.compile(r"\(?\d{2}\)?\s?\d{4,5}-\d{4}")
+SPECIFIC_DATA_PATTERN = re.compile(r"(\d{1,2}/\d{1,2}/\d{4}|R\$\s*\d+|\d{5}-?\d{3})")
+
+QualityResult = Tuple[Dict[str, Any], int, int]
+
+# Avaliador de cada processo do pool, definido pelo initializer
+_worker_evaluator = None
 
 
 class TextProcessor:
@@ -9,34 +54,123 @@ class TextProcessor:
     def clean_response(texto: str, categoria: str) -> str:
         """Limpa e formata a resposta gerada"""
         # Remove prefixos desnecessários
-        prefixes = [r"^(Prompt:|Texto:|Aqui está.*?:|Para.*?:)\s*"]
-        for prefix in prefixes:
-            texto = re.sub(prefix, "", texto.strip(), flags=re.IGNORECASE)
+        for prefix in PREFIX_PATTERNS:
+            texto = prefix.sub("", texto.strip())
 
         # Remove sufixos desnecessários
-        suffixes = [
-            r"\s*(---.*|EXEMPLO.*|NOTA:.*|OBSERVAÇÃO:.*|Espero.*|Fico.*|Aguardo.*)$"
-        ]
-        for suffix in suffixes:
-            texto = re.sub(suffix, "", texto, flags=re.IGNORECASE | re.DOTALL)
+        for suffix in SUFFIX_PATTERNS:
+            texto = suffix.sub("", texto)
 
         return texto.strip()
 
 
+class StreamingCleaner:
+    """Acumula uma resposta em streaming e indica quando ela pode parar.
+
+    A geração pode ser interrompida assim que surge um marcador de sufixo (tudo
+    a partir dele seria descartado por ``clean_response``) ou quando o texto
+    passa de ``max_words`` palavras.
+    """
+
+    def __init__(self, max_words: Optional[int] = None):
+        self.max_words = max_words
+        self.word_count = 0
+        self.stop_reason: Optional[str] = None
+        self._parts: List[str] = []
+        self._tail = ""
+        self._in_word = False
+
+    @property
+    def text(self) -> str:
+        return "".join(self._parts)
+
+    def feed(self, chunk: str) -> bool:
+        """Adiciona um trecho; retorna True quando a geração deve parar"""
+        self._parts.append(chunk)
+
+        # Mantém o final do trecho anterior para achar marcadores divididos
+        window = self._tail + chunk
+        if SUFFIX_MARKER_PATTERN.search(window):
+            self.stop_reason = "marker"
+            return True
+        self._tail = window[-(MAX_MARKER_LENGTH - 1) :]
+
+        new_words = len(WORD_PATTERN.findall(chunk))
+        if new_words and self._in_word and not chunk[0].isspace():
+            new_words -= 1  # continuação da última palavra
+        self.word_count += new_words
+        if chunk:
+            self._in_word = not chunk[-1].isspace()
+
+        if self.max_words is not None and self.word_count > self.max_words:
+            self.stop_reason = "max_words"
+            return True
+        return False
+
+
 class QualityEvaluator:
-    """Avalia a qualidade dos prompts gerados"""
+    """Avalia a qualidade dos prompts gerados.
+
+    As regras de cada categoria são compiladas uma única vez e apenas as da
+    categoria avaliada são executadas. Categorias registradas com
+    ``register_category`` podem declarar regras e limites de palavras em
+    ``metricas_qualidade``.
+    """
 
     def __init__(self, min_words: int = 200, max_words: int = 500):
         self.min_words = min_words
         self.max_words = max_words
-        # Limites específicos por categoria
-        self.category_limits = {
-            "comunicacao_interna": {"min": 50, "max": 300},
-            "suspensao": {"min": 150, "max": 600},
-            "financeiro": {"min": 200, "max": 700},
-            "avaliacao": {"min": 100, "max": 500},
-            "demissao_desligamento": {"min": 150, "max": 600},  # NOVA CATEGORIA
-        }
+        self._default_rule_sets = compile_default_rule_sets()
+        self.rule_sets: Dict[str, CategoryRuleSet] = dict(self._default_rule_sets)
+
+    def register_category(self, category: Category) -> None:
+        """Compila as regras declaradas no JSON da categoria.
+
+        Registrar de novo (após recarregar o arquivo) substitui as regras
+        anteriores da categoria.
+        """
+        try:
+            rule_set = compile_rule_set(category.metricas_qualidade)
+        except (ValueError, re.error) as e:
+            print(f"❌ Regras de qualidade inválidas em '{category.nome}': {e}")
+            return
+        default = self._default_rule_sets.get(category.nome)
+        self.rule_sets[category.nome] = (
+            default.merged_with(rule_set) if default else rule_set
+        )
+
+    def unregister_category(self, nome: str) -> None:
+        """Descarta as regras de uma categoria removida (as padrão permanecem)"""
+        default = self._default_rule_sets.get(nome)
+        if default:
+            self.rule_sets[nome] = default
+        else:
+            self.rule_sets.pop(nome, None)
+
+    def register_categories(self, categories: Iterable[Category]) -> None:
+        for category in categories:
+            self.register_category(category)
+
+    def get_word_limits(self, categoria: str = None) -> Tuple[int, int]:
+        """Limites de palavras da categoria, ou os limites padrão"""
+        rule_set = self.rule_sets.get(categoria) if categoria else None
+        if rule_set is None:
+            return self.min_words, self.max_words
+        return (
+            rule_set.min_words if rule_set.min_words is not None else self.min_words,
+            rule_set.max_words if rule_set.max_words is not None else self.max_words,
+        )
+
+    def boolean_metric_names(self, rule_names: Iterable[str] = ()) -> List[str]:
+        """Métricas booleanas base seguidas das regras registradas e de
+        ``rule_names`` (regras de categorias ainda não registradas)"""
+        rule_names = set(rule_names)
+        rule_names.update(
+            rule.name for rule_set in self.rule_sets.values() for rule in rule_set.rules
+        )
+        return list(BASE_BOOLEAN_METRICS) + sorted(
+            rule_names.difference(BASE_BOOLEAN_METRICS)
+        )
 
     def evaluate_quality(
         self, texto: str, categoria: str = None
@@ -60,103 +194,82 @@ class QualityEvaluator:
 
         return all_metrics, score, max_score
 
+    def evaluate_many(
+        self,
+        texts: Sequence[str],
+        categories: Union[Sequence[Optional[str]], str, None] = None,
+        max_workers: Optional[int] = None,
+        chunk_size: int = 256,
+        executor: Optional[ProcessPoolExecutor] = None,
+    ) -> List[QualityResult]:
+        """Avalia vários textos em um pool de processos, preservando a ordem.
+
+        ``categories`` pode ser uma categoria para todos os textos ou uma
+        sequência paralela a ``texts``. Lotes que cabem em um único chunk são
+        avaliados no próprio processo. Para várias chamadas seguidas, passe em
+        ``executor`` um pool criado por ``process_pool`` e reutilize-o.
+        """
+        if categories is None or isinstance(categories, str):
+            categories = [categories] * len(texts)
+        if len(categories) != len(texts):
+            raise ValueError("texts e categories devem ter o mesmo tamanho")
+
+        items = list(zip(texts, categories))
+        if len(items) <= chunk_size or max_workers == 1:
+            return [
+                self.evaluate_quality(texto, categoria) for texto, categoria in items
+            ]
+
+        chunks = [items[i : i + chunk_size] for i in range(0, len(items), chunk_size)]
+        if executor is not None:
+            return self._map_chunks(executor, chunks)
+        with self.process_pool(max_workers) as executor:
+            return self._map_chunks(executor, chunks)
+
+    def process_pool(self, max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+        """Pool de processos com uma cópia deste avaliador em cada worker"""
+        return ProcessPoolExecutor(
+            max_workers, initializer=_init_worker, initargs=(self,)
+        )
+
+    @staticmethod
+    def _map_chunks(
+        executor: ProcessPoolExecutor, chunks: List[List[Tuple[str, Optional[str]]]]
+    ) -> List[QualityResult]:
+        results: List[QualityResult] = []
+        for chunk_results in executor.map(_evaluate_chunk, chunks):
+            results.extend(chunk_results)
+        return results
+
     def _get_base_metrics(self, texto: str, categoria: str = None) -> Dict[str, Any]:
         """Obtém métricas base do texto"""
         word_count = len(texto.split())
-
-        # Use limites específicos da categoria se disponível
-        if categoria and categoria in self.category_limits:
-            min_words = self.category_limits[categoria]["min"]
-            max_words = self.category_limits[categoria]["max"]
-        else:
-            min_words = self.min_words
-            max_words = self.max_words
+        min_words, max_words = self.get_word_limits(categoria)
 
         return {
             "word_count": word_count,
-            "has_cpf": bool(re.search(r"\d{3}\.?\d{3}\.?\d{3}-?\d{2}", texto)),
-            "has_names": bool(re.search(r"[A-Z][a-z]+\s+[A-Z][a-z]+", texto)),
-            "has_emails": bool(
-                re.search(r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+", texto)
-            ),
-            "has_phones": bool(re.search(r"\(?\d{2}\)?\s?\d{4,5}-\d{4}", texto)),
-            "has_specific_data": bool(
-                re.search(r"(\d{1,2}/\d{1,2}/\d{4}|R\$\s*\d+|\d{5}-?\d{3})", texto)
-            ),
+            "has_cpf": bool(CPF_PATTERN.search(texto)),
+            "has_names": bool(NAME_PATTERN.search(texto)),
+            "has_emails": bool(EMAIL_PATTERN.search(texto)),
+            "has_phones": bool(PHONE_PATTERN.search(texto)),
+            "has_specific_data": bool(SPECIFIC_DATA_PATTERN.search(texto)),
             "ideal_length": min_words <= word_count <= max_words,
         }
 
     def _get_category_metrics(self, texto: str, categoria: str) -> Dict[str, bool]:
         """Obtém métricas específicas da categoria"""
-        if not categoria:
+        if not categoria or categoria not in self.rule_sets:
             return {}
+        return self.rule_sets[categoria].evaluate(texto)
+
+
+def _init_worker(evaluator: QualityEvaluator) -> None:
+    global _worker_evaluator
+    _worker_evaluator = evaluator
 
-        metrics_map = {
-            "suspensao": {
-                "has_evidence": bool(
-                    re.search(
-                        r"(evidência|testemunha|relatório|laudo)", texto, re.IGNORECASE
-                    )
-                ),
-                "has_period": bool(
-                    re.search(r"(\d+\s*(dia|semana|mês))", texto, re.IGNORECASE)
-                ),
-            },
-            "financeiro": {
-                "has_values": bool(re.search(r"R\$\s*[\d.,]+", texto)),
-                "has_calculations": bool(
-                    re.search(
-                        r"(análise|cálculo|auditoria|crédito)", texto, re.IGNORECASE
-                    )
-                ),
-            },
-            "avaliacao": {
-                "has_experience": bool(
-                    re.search(
-                        r"(experiência|formação|cargo|empresa)", texto, re.IGNORECASE
-                    )
-                ),
-                "has_skills": bool(
-                    re.search(
-                        r"(competência|habilidade|certificação)", texto, re.IGNORECASE
-                    )
-                ),
-            },
-            "comunicacao_interna": {
-                "mentions_date_time": bool(
-                    re.search(r"\d{1,2}/\d{1,2}/\d{2,4}|\d{1,2}h", texto)
-                ),
-                "has_objective": bool(
-                    re.search(
-                        r"(objetivo|assunto|tema|propósito)", texto, re.IGNORECASE
-                    )
-                ),
-            },
-            # NOVA CATEGORIA ADICIONADA
-            "demissao_desligamento": {
-                "has_rescision_terms": bool(
-                    re.search(
-                        r"(rescisão|rescisório|demissão|desligamento|aviso prévio)",
-                        texto,
-                        re.IGNORECASE,
-                    )
-                ),
-                "has_employment_data": bool(
-                    re.search(
-                        r"(matrícula|admissão|admitido|contratado|salário)",
-                        texto,
-                        re.IGNORECASE,
-                    )
-                ),
-                "has_legal_procedures": bool(
-                    re.search(
-                        r"(homologação|sindicato|CLT|FGTS|13º|férias)",
-                        texto,
-                        re.IGNORECASE,
-                    )
-                ),
-                "has_financial_calculations": bool(re.search(r"R\$\s*[\d.,]+", texto)),
-            },
-        }
 
-        return metrics_map.get(categoria, {})
+def _evaluate_chunk(items: List[Tuple[str, Optional[str]]]) -> List[QualityResult]:
+    return [
+        _worker_evaluator.evaluate_quality(texto, categoria)
+        for texto, categoria in items
+    ]
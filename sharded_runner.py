@@ -0,0 +1,167 @@
+"""Geração em lote dividida entre vários processos.
+
+Todo o trabalho de CPU do gerador (perfis, montagem do prompt, limpeza e
+avaliação) disputa o mesmo GIL dentro de um processo. Aqui o plano do lote é
+dividido em ``shards`` partes, cada uma executada por um processo com seu
+próprio ``ModularPromptGenerator``. Cada processo grava um arquivo parcial e,
+ao final, os arquivos são combinados em uma única exportação JSONL na ordem
+dos jobs, então a mesma seed produz sempre o mesmo arquivo.
+
+Uso:
+    python sharded_runner.py --num-prompts 1000 --shards 4 --seed 42
+"""
+
+import argparse
+import concurrent.futures
+import dataclasses
+import heapq
+import json
+import random
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+from config.settings import AppConfig, LLMConfig
+from modular_prompt_generator import ModularPromptGenerator
+from models.job import PlannedJob, iter_jobs
+from services.category_loader import CategoryLoader
+from utils.export_utils import PromptExporter
+
+
+def shard_path(output_file: Path, shard: int) -> Path:
+    output_file = Path(output_file)
+    return output_file.with_name(f"{output_file.name}.shard-{shard}")
+
+
+def plan_sharded_jobs(
+    config: AppConfig,
+    num_prompts: int,
+    seed: int,
+    category_filter: Optional[List[str]] = None,
+) -> List[PlannedJob]:
+    """Mesmo plano que ``ModularPromptGenerator.plan_jobs`` para a seed"""
+    categories = category_filter or list(
+        CategoryLoader(config.examples_dir, config.category_index_path).build_index()
+    )
+    return list(iter_jobs(categories, num_prompts, seed))
+
+
+def run_shard(
+    config: AppConfig, jobs: List[PlannedJob], output_file: Path, max_workers: int
+) -> int:
+    """Executa os jobs de um shard, gravando cada prompt com seu job_index.
+
+    Os prompts são gravados na ordem dos jobs, o que permite combinar os
+    shards sem carregá-los (ver ``merge_shards``).
+    """
+    # Jobs com seed não usam o pool de perfis
+    generator = ModularPromptGenerator(
+        dataclasses.replace(config, use_profile_pool=False)
+    )
+    count = 0
+    try:
+        with open(output_file, "w", encoding="utf-8") as f:
+            for prompt in generator.iter_generate(
+                jobs=jobs, max_workers=max_workers, ordered=True
+            ):
+                record = PromptExporter.to_jsonl_record(prompt, prompt_id=None)
+                record["job_index"] = prompt.job_index
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                count += 1
+    finally:
+        generator.close()
+    return count
+
+
+def read_shard(shard_file: Path) -> Iterator[dict]:
+    with open(shard_file, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def merge_shards(shard_files: List[Path], output_file: Path) -> int:
+    """Combina os arquivos parciais em ordem de job, numerando os prompts.
+
+    Cada shard já está em ordem de job, então os arquivos são intercalados
+    em streaming: só um registro por shard fica em memória.
+    """
+    shards = [read_shard(shard_file) for shard_file in shard_files]
+    total = 0
+    with open(output_file, "w", encoding="utf-8") as f:
+        for record in heapq.merge(*shards, key=lambda record: record["job_index"]):
+            total += 1
+            del record["job_index"]
+            record["prompt_id"] = total
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    return total
+
+
+def run_sharded(
+    config: AppConfig,
+    num_prompts: int,
+    output_file: Path,
+    seed: int,
+    shards: int,
+    category_filter: Optional[List[str]] = None,
+) -> int:
+    """Gera ``num_prompts`` prompts em ``shards`` processos; retorna o total"""
+    if shards < 1:
+        raise ValueError("O número de shards deve ser pelo menos 1")
+
+    jobs = plan_sharded_jobs(config, num_prompts, seed, category_filter)
+    if not jobs:
+        print("❌ Nenhuma categoria disponível para geração em lote!")
+        return 0
+
+    shards = min(shards, len(jobs))
+    # As requisições simultâneas ao LLM são divididas entre os processos
+    max_workers = max(1, config.max_in_flight // shards)
+    shard_files = [shard_path(output_file, shard) for shard in range(shards)]
+
+    print(f"🧩 Dividindo {len(jobs)} jobs entre {shards} processos (seed {seed})")
+    with concurrent.futures.ProcessPoolExecutor(shards) as executor:
+        futures = [
+            executor.submit(
+                run_shard, config, jobs[shard::shards], shard_file, max_workers
+            )
+            for shard, shard_file in enumerate(shard_files)
+        ]
+        for shard, future in enumerate(futures):
+            print(f"✅ Shard {shard}: {future.result()} prompts")
+
+    total = merge_shards(shard_files, output_file)
+    for shard_file in shard_files:
+        shard_file.unlink()
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Geração de prompts em lote dividida entre processos"
+    )
+    parser.add_argument("--num-prompts", type=int, default=100)
+    parser.add_argument(
+        "--output", type=Path, default=Path("outputs/prompts_export.jsonl")
+    )
+    parser.add_argument("--shards", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument(
+        "--categories",
+        default=None,
+        help="Categorias separadas por vírgula (padrão: todas)",
+    )
+    args = parser.parse_args()
+
+    seed = args.seed if args.seed is not None else random.randrange(2**31)
+    category_filter = args.categories.split(",") if args.categories else None
+    config = AppConfig(llm_config=LLMConfig())
+
+    args.output.parent.mkdir(exist_ok=True)
+    total = run_sharded(
+        config, args.num_prompts, args.output, seed, args.shards, category_filter
+    )
+    print(f"✅ {total} prompts exportados para {args.output} (seed {seed})")
+
+
+if __name__ == "__main__":
+    main()
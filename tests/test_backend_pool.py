@@ -0,0 +1,81 @@
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+from config.settings import LLMConfig
+from services.backend_pool import BackendPool
+from services.llm_service import LLMService
+from utils.ollama_stub import start_stub_server
+
+
+def start_stub_process():
+    """Stub em outro processo, para poder matá-lo com conexões abertas"""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    process = subprocess.Popen(
+        [sys.executable, "-m", "utils.ollama_stub", "--port", str(port)],
+        cwd=Path(__file__).resolve().parent.parent,
+        stdout=subprocess.DEVNULL,
+    )
+    host = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 10
+    while True:
+        try:
+            httpx.get(f"{host}/api/version", timeout=1)
+            return process, host
+        except httpx.HTTPError:
+            if time.monotonic() > deadline:
+                process.kill()
+                raise
+            time.sleep(0.05)
+
+
+def test_surviving_host_takes_over_when_another_dies():
+    process, dead_host = start_stub_process()
+    alive = start_stub_server()
+    service = LLMService(
+        LLMConfig(hosts=[dead_host, alive.host], health_check_interval=60)
+    )
+    try:
+        for _ in range(4):
+            assert service.generate_response("prompt", use_cache=False)
+        assert alive.requests == 2
+
+        process.kill()
+        process.wait()
+
+        for _ in range(10):
+            assert service.generate_response("prompt", use_cache=False)
+
+        assert alive.requests == 12
+        stats = service.backend_pool.stats()
+        assert not stats[dead_host]["healthy"]
+        assert stats[alive.host]["healthy"]
+    finally:
+        service.close()
+        process.kill()
+        alive.shutdown()
+        alive.server_close()
+
+
+def test_last_healthy_host_is_never_ejected():
+    stub = start_stub_server()
+    pool = BackendPool([stub.host], failure_threshold=2)
+    try:
+        for _ in range(5):
+            backend = pool.acquire()
+            pool.release(backend, 0.1, success=False)
+        stub.fail = True
+        pool.check_health()
+
+        assert pool.acquire().healthy
+        assert pool.acquire_other(backend) is None
+    finally:
+        pool.close()
+        stub.shutdown()
+        stub.server_close()
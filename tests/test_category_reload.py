@@ -0,0 +1,80 @@
+import json
+import os
+
+from config.settings import AppConfig
+from modular_prompt_generator import ModularPromptGenerator
+from services.category_loader import CategoryLoader
+
+EXTRA = {
+    "categoria": "extra",
+    "descricao": "Categoria de teste",
+    "exemplos": [{"prompt": "Elabore o comunicado de extra."}],
+    "metricas_qualidade": {"regras": {"has_extra": "extra"}},
+}
+
+
+def make_generator(tmp_path):
+    examples_dir = tmp_path / "examples"
+    examples_dir.mkdir()
+    with open(examples_dir / "extra.json", "w", encoding="utf-8") as f:
+        json.dump(EXTRA, f)
+    return ModularPromptGenerator(
+        AppConfig(
+            examples_dir=examples_dir,
+            category_index_path=tmp_path / "index.json",
+            category_corpus_path=None,
+            use_profile_pool=False,
+        )
+    )
+
+
+def test_deleted_category_drops_its_rules(tmp_path):
+    generator = make_generator(tmp_path)
+    try:
+        generator.get_category("extra")
+        assert "has_extra" in generator.quality_evaluator.boolean_metric_names()
+
+        # Outro arquivo para que o diretório não fique vazio
+        with open(tmp_path / "examples" / "outra.json", "w", encoding="utf-8") as f:
+            json.dump({**EXTRA, "categoria": "outra", "metricas_qualidade": {}}, f)
+        os.remove(tmp_path / "examples" / "extra.json")
+
+        assert generator.reload_categories()
+        assert "extra" not in generator.quality_evaluator.rule_sets
+        assert "has_extra" not in generator.quality_evaluator.boolean_metric_names()
+    finally:
+        generator.close()
+
+
+def test_invalid_file_is_skipped_until_it_changes(tmp_path, monkeypatch):
+    generator = make_generator(tmp_path)
+    bad_file = tmp_path / "examples" / "quebrada.json"
+    bad_file.write_text('{"categoria": "quebr', encoding="utf-8")
+
+    calls = {"index_file": 0, "write_index": 0}
+    index_file = CategoryLoader._index_file
+    write_index = CategoryLoader._write_index
+
+    def counting_index_file(self, *args):
+        calls["index_file"] += 1
+        return index_file(self, *args)
+
+    def counting_write_index(self, *args):
+        calls["write_index"] += 1
+        return write_index(self, *args)
+
+    monkeypatch.setattr(CategoryLoader, "_index_file", counting_index_file)
+    monkeypatch.setattr(CategoryLoader, "_write_index", counting_write_index)
+    try:
+        for _ in range(3):
+            assert not generator.reload_categories()
+        assert calls == {"index_file": 1, "write_index": 0}
+
+        bad_file.write_text(
+            json.dumps({**EXTRA, "categoria": "quebrada"}), encoding="utf-8"
+        )
+        assert generator.reload_categories()
+        assert "quebrada" in generator.get_available_categories()
+        assert calls == {"index_file": 2, "write_index": 1}
+    finally:
+        generator.close()
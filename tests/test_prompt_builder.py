@@ -0,0 +1,28 @@
+import random
+
+from config.settings import AppConfig
+from pii_generator import PIIGenerator
+from services.category_loader import CategoryLoader
+from services.prompt_builder import DEFAULT_PROFILE_FIELDS, PromptBuilder
+from utils.token_counter import estimate_tokens
+
+
+def test_default_profile_fields_drop_unused_pii():
+    profile = PIIGenerator(seed=1).get_full_profile(sex="F")
+    assert set(DEFAULT_PROFILE_FIELDS) < set(profile)
+
+
+def test_compact_prompt_is_shorter_than_classic():
+    categories = CategoryLoader(AppConfig().examples_dir).load_all_categories()
+    assert categories
+    pii = PIIGenerator(seed=1)
+    profiles = [pii.get_full_profile(sex="M") for _ in range(3)]
+
+    for category in categories.values():
+        classic = PromptBuilder().build_specialized_prompt(
+            category, profiles, 2, rng=random.Random(0)
+        )
+        compact = PromptBuilder(compact_profiles=True).build_specialized_prompt(
+            category, profiles, 2, rng=random.Random(0)
+        )
+        assert estimate_tokens(compact) < estimate_tokens(classic), category.nome
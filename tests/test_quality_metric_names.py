@@ -0,0 +1,34 @@
+import json
+
+from config.settings import AppConfig
+from modular_prompt_generator import ModularPromptGenerator
+from services.text_processor import BASE_BOOLEAN_METRICS
+
+
+def test_metric_names_come_from_the_index_without_loading(tmp_path):
+    examples_dir = tmp_path / "examples"
+    examples_dir.mkdir()
+    category = {
+        "categoria": "extra",
+        "exemplos": [{"prompt": "Elabore o comunicado de extra."}],
+        "metricas_qualidade": {"regras": {"has_extra": "extra"}},
+    }
+    with open(examples_dir / "extra.json", "w", encoding="utf-8") as f:
+        json.dump(category, f)
+    config = AppConfig(
+        examples_dir=examples_dir,
+        category_index_path=tmp_path / "index.json",
+        category_corpus_path=None,
+        use_profile_pool=False,
+    )
+
+    # O segundo gerador lê as regras do índice salvo pelo primeiro
+    for _ in range(2):
+        generator = ModularPromptGenerator(config)
+        try:
+            names = generator.quality_metric_names()
+            assert not generator.categories.is_loaded("extra")
+        finally:
+            generator.close()
+        assert names[: len(BASE_BOOLEAN_METRICS)] == list(BASE_BOOLEAN_METRICS)
+        assert "has_extra" in names
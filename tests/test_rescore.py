@@ -0,0 +1,37 @@
+import json
+
+from services.text_processor import QualityEvaluator
+from utils.rescore import rescore_file
+
+TEXT = "Maria Silva, CPF 123.456.789-09, relatório de 3 dias de suspensão"
+
+
+def test_rescore_reuses_one_pool_and_accepts_json_export_categories(
+    tmp_path, monkeypatch
+):
+    input_file = tmp_path / "prompts.jsonl"
+    with open(input_file, "w", encoding="utf-8") as f:
+        for i in range(700):
+            # Formato JSONL (nome) e formato da exportação JSON (objeto)
+            category = "suspensao" if i % 2 else {"nome": "suspensao"}
+            f.write(json.dumps({"category": category, "text": TEXT}) + "\n")
+
+    pools = []
+    process_pool = QualityEvaluator.process_pool
+
+    def counting_pool(self, max_workers=None):
+        pools.append(max_workers)
+        return process_pool(self, max_workers)
+
+    monkeypatch.setattr(QualityEvaluator, "process_pool", counting_pool)
+
+    output_file = tmp_path / "rescored.jsonl"
+    total = rescore_file(
+        input_file, output_file, QualityEvaluator(), max_workers=2, block_size=300
+    )
+
+    assert total == 700
+    assert pools == [2]
+    with open(output_file, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    assert all(record["metrics"]["has_evidence"] for record in records)
@@ -0,0 +1,27 @@
+from models.job import PlannedJob
+from utils.run_journal import RunJournal
+
+JOBS = [PlannedJob(index, "financeiro", index) for index in range(4)]
+
+
+def test_resume_twice_after_torn_last_line(tmp_path):
+    path = tmp_path / "prompts.jsonl.journal"
+    with RunJournal.create(path, JOBS, run_seed=1) as journal:
+        journal.mark_done(0, 1)
+
+    # Interrupção no meio da gravação de um registro
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"type": "done", "jo')
+
+    with RunJournal.load(path) as journal:
+        assert journal.completed == {0: 1}
+        journal.mark_done(1, 2)
+
+    with RunJournal.load(path) as journal:
+        assert journal.completed == {0: 1, 1: 2}
+        assert [job.index for job in journal.pending_jobs()] == [2, 3]
+        journal.mark_done(2, 3)
+
+    journal = RunJournal.load(path)
+    assert journal.completed == {0: 1, 1: 2, 2: 3}
+    assert journal.jobs == JOBS
@@ -0,0 +1,56 @@
+import json
+import random
+import time
+
+from config.settings import AppConfig
+from modular_prompt_generator import GeneratedPrompt, ModularPromptGenerator
+from models.job import PlannedJob
+from sharded_runner import merge_shards
+
+
+def test_ordered_iter_generate_follows_job_order(tmp_path, monkeypatch):
+    generator = ModularPromptGenerator(
+        AppConfig(
+            category_index_path=tmp_path / "index.json",
+            category_corpus_path=None,
+            use_profile_pool=False,
+        )
+    )
+    rng = random.Random(0)
+    delays = [rng.uniform(0, 0.01) for _ in range(40)]
+
+    def timed_generate(job):
+        time.sleep(delays[job.index])
+        # Um job que falha não pode travar os seguintes
+        if job.index == 7:
+            return None, 0.0
+        return GeneratedPrompt(str(job.index), None, None, {}, 0, 0), 0.0
+
+    monkeypatch.setattr(generator, "_timed_generate", timed_generate)
+    jobs = [PlannedJob(index, "financeiro", index) for index in range(40)]
+    try:
+        prompts = list(generator.iter_generate(jobs=jobs, max_workers=4, ordered=True))
+    finally:
+        generator.close()
+
+    assert [prompt.job_index for prompt in prompts] == [
+        index for index in range(40) if index != 7
+    ]
+
+
+def test_merge_shards_interleaves_in_job_order(tmp_path):
+    shard_files = []
+    for shard in range(3):
+        shard_file = tmp_path / f"prompts.jsonl.shard-{shard}"
+        with open(shard_file, "w", encoding="utf-8") as f:
+            for job_index in range(shard, 20, 3):
+                record = {"job_index": job_index, "text": str(job_index)}
+                f.write(json.dumps(record) + "\n")
+        shard_files.append(shard_file)
+
+    output_file = tmp_path / "prompts.jsonl"
+    assert merge_shards(shard_files, output_file) == 20
+    with open(output_file, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    assert [record["text"] for record in records] == [str(i) for i in range(20)]
+    assert [record["prompt_id"] for record in records] == list(range(1, 21))
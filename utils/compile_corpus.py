@@ -0,0 +1,34 @@
+"""Compila os arquivos de exemplo em um corpus binário para inicialização rápida.
+
+Uso:
+    python -m utils.compile_corpus [--examples-dir examples] [-o .cache/categories.corpus]
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from config.settings import AppConfig
+from services.category_loader import CategoryLoader
+
+
+def main():
+    config = AppConfig()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--examples-dir", type=Path, default=config.examples_dir)
+    parser.add_argument(
+        "-o", "--output", type=Path, default=config.category_corpus_path
+    )
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    loader = CategoryLoader(args.examples_dir, config.category_index_path)
+    count = loader.compile_corpus(args.output)
+    print(
+        f"✅ {count} categorias compiladas em {args.output} "
+        f"({time.perf_counter() - start:.2f}s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
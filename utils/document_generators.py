@@ -0,0 +1,125 @@
+import random
+from typing import Dict, List, Optional, Sequence
+
+# Prefixos (IIN) usados para cada bandeira e o tamanho do número do cartão
+CARD_BRANDS = {
+    "Visa": (["4"], 16),
+    "Mastercard": (["51", "52", "53", "54", "55"], 16),
+    "Elo": (["401178", "438935", "451416", "504175", "636297", "636368"], 16),
+    "American Express": (["34", "37"], 15),
+}
+
+VEHICLE_MODELS = {
+    "Chevrolet": ["Onix", "Tracker", "S10", "Cruze"],
+    "Volkswagen": ["Gol", "Polo", "T-Cross", "Virtus"],
+    "Fiat": ["Argo", "Mobi", "Strada", "Toro"],
+    "Hyundai": ["HB20", "Creta", "Tucson"],
+    "Toyota": ["Corolla", "Hilux", "Yaris"],
+    "Renault": ["Kwid", "Sandero", "Duster"],
+    "Honda": ["Civic", "City", "HR-V"],
+    "Jeep": ["Renegade", "Compass"],
+}
+
+PLATE_LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
+def _mod11_digit(digits: Sequence[int], weights: Sequence[int]) -> int:
+    """Dígito verificador módulo 11 usado por CPF e CNPJ"""
+    remainder = sum(d * w for d, w in zip(digits, weights)) % 11
+    return 0 if remainder < 2 else 11 - remainder
+
+
+def _random_digits(count: int, rng: Optional[random.Random]) -> List[int]:
+    rng = rng or random
+    return [rng.randint(0, 9) for _ in range(count)]
+
+
+def cpf(formatting: bool = True, rng: Optional[random.Random] = None) -> str:
+    """Gera um CPF com dígitos verificadores válidos"""
+    digits = _random_digits(9, rng)
+    while len(set(digits)) == 1:  # 111.111.111-11 e similares são inválidos
+        digits = _random_digits(9, rng)
+
+    digits.append(_mod11_digit(digits, range(10, 1, -1)))
+    digits.append(_mod11_digit(digits, range(11, 1, -1)))
+
+    number = "".join(map(str, digits))
+    if not formatting:
+        return number
+    return f"{number[:3]}.{number[3:6]}.{number[6:9]}-{number[9:]}"
+
+
+def cnpj(formatting: bool = True, rng: Optional[random.Random] = None) -> str:
+    """Gera um CNPJ (matriz 0001) com dígitos verificadores válidos"""
+    digits = _random_digits(8, rng) + [0, 0, 0, 1]
+    weights = [5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]
+
+    digits.append(_mod11_digit(digits, weights))
+    digits.append(_mod11_digit(digits, [6] + weights))
+
+    number = "".join(map(str, digits))
+    if not formatting:
+        return number
+    return f"{number[:2]}.{number[2:5]}.{number[5:8]}/{number[8:12]}-{number[12:]}"
+
+
+def renavam(rng: Optional[random.Random] = None) -> str:
+    """Gera um RENAVAM de 11 dígitos com dígito verificador válido"""
+    digits = _random_digits(10, rng)
+    weights = [3, 2, 9, 8, 7, 6, 5, 4, 3, 2]
+    check_digit = (sum(d * w for d, w in zip(digits, weights)) * 10) % 11
+    digits.append(0 if check_digit == 10 else check_digit)
+    return "".join(map(str, digits))
+
+
+def vehicle_plate(
+    formatting: bool = True, mercosul: bool = False, rng: Optional[random.Random] = None
+) -> str:
+    """Gera uma placa no padrão antigo (ABC-1234) ou Mercosul (ABC1D23)"""
+    rng = rng or random
+    letters = "".join(rng.choice(PLATE_LETTERS) for _ in range(3))
+    numbers = "".join(map(str, _random_digits(4, rng)))
+
+    if mercosul:
+        return f"{letters}{numbers[0]}{rng.choice(PLATE_LETTERS)}{numbers[2:]}"
+    return f"{letters}-{numbers}" if formatting else f"{letters}{numbers}"
+
+
+def luhn_check_digit(partial_number: str) -> int:
+    """Calcula o dígito de Luhn para um número sem o dígito final"""
+    total = 0
+    for i, char in enumerate(reversed(partial_number)):
+        digit = int(char)
+        if i % 2 == 0:
+            digit *= 2
+            if digit > 9:
+                digit -= 9
+        total += digit
+    return (10 - total % 10) % 10
+
+
+def credit_card(
+    brand: Optional[str] = None,
+    formatting: bool = True,
+    rng: Optional[random.Random] = None,
+) -> Dict[str, str]:
+    """Gera um número de cartão válido pelo algoritmo de Luhn"""
+    rng = rng or random
+    brand = brand or rng.choice(list(CARD_BRANDS))
+    prefixes, length = CARD_BRANDS[brand]
+
+    partial = rng.choice(prefixes)
+    partial += "".join(map(str, _random_digits(length - len(partial) - 1, rng)))
+    number = partial + str(luhn_check_digit(partial))
+
+    if formatting:
+        number = " ".join(number[i : i + 4] for i in range(0, len(number), 4))
+
+    return {"credit_card": number, "credit_card_brand": brand}
+
+
+def vehicle(rng: Optional[random.Random] = None) -> Dict[str, str]:
+    """Sorteia marca e modelo de um catálogo local de veículos"""
+    rng = rng or random
+    brand = rng.choice(list(VEHICLE_MODELS))
+    return {"brand": brand, "model": rng.choice(VEHICLE_MODELS[brand])}
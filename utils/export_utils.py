@@ -1,25 +1,80 @@
+import gzip
+import io
 import json
 import csv
-from typing import List
+from typing import IO, Any, Dict, Iterable, List, Optional, Sequence
 from pathlib import Path
 from datetime import datetime
 
 from modular_prompt_generator import GeneratedPrompt
 
+try:
+    import orjson
+except ImportError:  # opcional: codificação JSON mais rápida
+    orjson = None
+
+WRITE_BUFFER_SIZE = 1 << 20  # 1 MiB
+COMPRESSIONS = ("gzip", "zstd")
+_SUFFIX_COMPRESSION = {".gz": "gzip", ".zst": "zstd"}
+
+
+def dumps_json(data: Any) -> bytes:
+    """JSON em UTF-8 (sem escapar acentos), com orjson quando instalado"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+
+def resolve_compression(output_file: Path, compression: Optional[str]) -> Optional[str]:
+    """``compression="auto"`` escolhe pela extensão (.gz, .zst)"""
+    if compression == "auto":
+        return _SUFFIX_COMPRESSION.get(Path(output_file).suffix)
+    if compression is not None and compression not in COMPRESSIONS:
+        raise ValueError(
+            f"Compressão inválida '{compression}'. Opções: {', '.join(COMPRESSIONS)}"
+        )
+    return compression
+
+
+def open_output(
+    output_file: Path, compression: Optional[str] = None, append: bool = False
+) -> IO[bytes]:
+    """Abre um arquivo binário com buffer grande e compressão opcional.
+
+    ``append`` só é aceito sem compressão.
+    """
+    if compression is None:
+        mode = "ab" if append else "wb"
+        return open(output_file, mode, buffering=WRITE_BUFFER_SIZE)
+    if append:
+        raise ValueError("Acrescentar a um arquivo comprimido não é suportado")
+
+    if compression == "gzip":
+        compressed = gzip.open(output_file, "wb", compresslevel=6)
+    else:
+        try:
+            import zstandard
+        except ImportError:
+            raise RuntimeError(
+                "Compressão zstd requer o pacote 'zstandard' (pip install zstandard)"
+            )
+        compressed = zstandard.ZstdCompressor().stream_writer(open(output_file, "wb"))
+    # Agrupa as escritas pequenas antes de passarem pelo compressor
+    return io.BufferedWriter(compressed, WRITE_BUFFER_SIZE)
+
 
 class PromptExporter:
 
     @staticmethod
-    def export_to_json(prompts: List["GeneratedPrompt"], output_file: Path) -> bool:
+    def export_to_json(
+        prompts: Iterable["GeneratedPrompt"],
+        output_file: Path,
+        compression: Optional[str] = "auto",
+    ) -> bool:
         try:
-            data = {
-                "export_date": datetime.now().isoformat(),
-                "total_prompts": len(prompts),
-                "prompts": [prompt.to_dict() for prompt in prompts],
-            }
-
-            with open(output_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            with JsonArraySink(output_file, compression=compression) as sink:
+                for prompt in prompts:
+                    sink.write(prompt)
 
             print(f"✅ Prompts exportados para {output_file}")
             return True
@@ -73,23 +128,17 @@ class PromptExporter:
             return False
 
     @staticmethod
-    def export_to_jsonl(prompts: List["GeneratedPrompt"], output_file: Path) -> bool:
+    def export_to_jsonl(
+        prompts: Iterable["GeneratedPrompt"],
+        output_file: Path,
+        compression: Optional[str] = "auto",
+    ) -> bool:
         try:
-            with open(output_file, "w", encoding="utf-8") as f:
-                for i, prompt in enumerate(prompts):
-                    clean_text = " ".join(
-                        prompt.content.replace("\n", " ")
-                        .replace("\r", " ")
-                        .replace("\t", " ")
-                        .split()
-                    )
-
-                    jsonl_data = {
-                        "prompt_id": i + 1,
-                        "text": clean_text,
-                    }
-
-                    f.write(json.dumps(jsonl_data, ensure_ascii=False) + "\n")
+            with JsonlSink(
+                output_file, compression=compression, flush_each=False
+            ) as sink:
+                for prompt in prompts:
+                    sink.write(prompt)
 
             print(f"✅ Prompts exportados para {output_file} (formato JSONL)")
             return True
@@ -97,3 +146,271 @@ class PromptExporter:
         except Exception as e:
             print(f"❌ Erro ao exportar JSONL: {e}")
             return False
+
+    @staticmethod
+    def export_to_parquet(
+        prompts: Iterable["GeneratedPrompt"],
+        output_file: Path,
+        metric_names: Sequence[str],
+        row_group_size: int = 10_000,
+    ) -> bool:
+        """Exporta em Parquet, gravando um row group a cada ``row_group_size``.
+
+        Como ``prompts`` é consumido sob demanda, passar
+        ``generator.iter_generate(...)`` grava os row groups durante a geração.
+        ``metric_names`` são as colunas de métricas, normalmente
+        ``generator.quality_metric_names()``.
+        """
+        try:
+            with ParquetSink(
+                output_file, metric_names=metric_names, row_group_size=row_group_size
+            ) as sink:
+                for prompt in prompts:
+                    sink.write(prompt)
+
+            print(f"✅ Prompts exportados para {output_file} (formato Parquet)")
+            return True
+
+        except Exception as e:
+            print(f"❌ Erro ao exportar Parquet: {e}")
+            return False
+
+    @staticmethod
+    def to_jsonl_record(prompt: "GeneratedPrompt", prompt_id: int) -> Dict[str, Any]:
+        clean_text = " ".join(
+            prompt.content.replace("\n", " ")
+            .replace("\r", " ")
+            .replace("\t", " ")
+            .split()
+        )
+
+        return {
+            "prompt_id": prompt_id,
+            "category": prompt.category.nome,
+            "text": clean_text,
+        }
+
+
+class JsonlSink:
+    """Grava prompts em JSONL à medida que são gerados.
+
+    Sem compressão e com ``flush_each`` (padrão) cada linha é enviada ao
+    sistema operacional logo após ser escrita, então uma interrupção perde no
+    máximo o prompt em andamento; sem ``flush_each`` as linhas se acumulam em
+    um buffer de 1 MiB, bem mais rápido para exportações grandes.
+
+    ``compression`` ("gzip", "zstd" ou "auto", pela extensão) comprime a
+    saída. Um arquivo comprimido só fica íntegro após ``close``: ele não serve
+    para execuções com diário (``RunJournal``), e ``append=True``, usado ao
+    retomar, exige saída sem compressão. Com ``append=True`` a numeração
+    continua a partir das linhas já existentes no arquivo.
+    """
+
+    def __init__(
+        self,
+        output_file: Path,
+        append: bool = False,
+        compression: Optional[str] = "auto",
+        flush_each: bool = True,
+    ):
+        self.output_file = Path(output_file)
+        self.append = append
+        self.compression = resolve_compression(self.output_file, compression)
+        if append and self.compression is not None:
+            raise ValueError(
+                f"Não é possível acrescentar a {self.output_file}: "
+                "retomar uma exportação exige saída sem compressão"
+            )
+        self.flush_each = flush_each
+        self.count = 0
+        self._next_id = 1
+        self._file = None
+
+    def __enter__(self) -> "JsonlSink":
+        self.open()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def open(self) -> None:
+        append = self.append and self.output_file.exists()
+        self._next_id = self._count_existing_lines() + 1 if append else 1
+        self._file = open_output(self.output_file, self.compression, append)
+
+    def write(self, prompt: "GeneratedPrompt") -> int:
+        """Grava um prompt e retorna o prompt_id atribuído"""
+        prompt_id = self._next_id
+        record = PromptExporter.to_jsonl_record(prompt, prompt_id)
+        self._file.write(dumps_json(record) + b"\n")
+        if self.flush_each:
+            self._file.flush()
+        self._next_id += 1
+        self.count += 1
+        return prompt_id
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _count_existing_lines(self) -> int:
+        with open(self.output_file, "rb") as f:
+            return sum(1 for line in f if line.strip())
+
+
+class JsonArraySink:
+    """Grava o JSON de exportação (``export_date``, ``prompts``,
+    ``total_prompts``) em streaming, um prompt por vez.
+
+    O arquivo é um único objeto JSON válido, mas nenhum momento exige a lista
+    inteira em memória: o total é gravado depois da lista.
+    """
+
+    def __init__(self, output_file: Path, compression: Optional[str] = "auto"):
+        self.output_file = Path(output_file)
+        self.compression = resolve_compression(self.output_file, compression)
+        self.count = 0
+        self._file = None
+
+    def __enter__(self) -> "JsonArraySink":
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, *exc_info) -> None:
+        self.close(complete=exc_type is None)
+
+    def open(self) -> None:
+        self.count = 0
+        self._file = open_output(self.output_file, self.compression)
+        export_date = dumps_json(datetime.now().isoformat())
+        self._file.write(b'{"export_date": ' + export_date + b', "prompts": [')
+
+    def write(self, prompt: "GeneratedPrompt") -> None:
+        self._file.write(b"\n" if self.count == 0 else b",\n")
+        self._file.write(dumps_json(prompt.to_dict()))
+        self.count += 1
+
+    def close(self, complete: bool = True) -> None:
+        """Fecha a lista; com ``complete=False`` o arquivo fica incompleto"""
+        if self._file is None:
+            return
+        if complete:
+            self._file.write(b"\n], " + b'"total_prompts": %d}\n' % self.count)
+        self._file.close()
+        self._file = None
+
+
+class ParquetSink:
+    """Grava prompts em Parquet, com colunas tipadas, um row group por vez.
+
+    Colunas: ``category``, ``content``, ``word_count``,
+    ``score``, ``max_score`` e uma coluna booleana por métrica de
+    ``QualityEvaluator``; métricas que não se aplicam à categoria do prompt
+    ficam nulas. ``metric_names`` (ver
+    ``ModularPromptGenerator.quality_metric_names``) define essas colunas;
+    métricas fora da lista não são exportadas e são listadas em ``close``.
+
+    Cada ``row_group_size`` prompts viram um row group gravado no arquivo, então
+    a memória usada não cresce com a exportação. O rodapé do Parquet só é
+    gravado em ``close``: até lá o arquivo não pode ser lido.
+    """
+
+    def __init__(
+        self,
+        output_file: Path,
+        metric_names: Sequence[str],
+        row_group_size: int = 10_000,
+        compression: str = "zstd",
+    ):
+        if row_group_size < 1:
+            raise ValueError("row_group_size deve ser pelo menos 1")
+        self.output_file = Path(output_file)
+        self.metric_names = list(metric_names)
+        self.row_group_size = row_group_size
+        self.compression = compression
+        self.count = 0
+        self._pa = None
+        self._writer = None
+        self._schema = None
+        self._rows: List["GeneratedPrompt"] = []
+        self._dropped_metrics = set()
+
+    def __enter__(self) -> "ParquetSink":
+        self.open()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def open(self) -> None:
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise RuntimeError(
+                "Exportação Parquet requer o pacote 'pyarrow' (pip install pyarrow)"
+            )
+        self._pa = pyarrow
+        self._schema = self._build_schema()
+        self._writer = pyarrow.parquet.ParquetWriter(
+            str(self.output_file), self._schema, compression=self.compression
+        )
+        self.count = 0
+        self._rows = []
+
+    def write(self, prompt: "GeneratedPrompt") -> None:
+        self._rows.append(prompt)
+        self.count += 1
+        if len(self._rows) >= self.row_group_size:
+            self._write_row_group()
+
+    def close(self) -> None:
+        if self._writer is None:
+            return
+        if self._rows:
+            self._write_row_group()
+        self._writer.close()
+        self._writer = None
+        self._schema = None
+        self._pa = None
+        if self._dropped_metrics:
+            print(
+                f"⚠️  Métricas fora do esquema não exportadas: "
+                f"{', '.join(sorted(self._dropped_metrics))}"
+            )
+
+    def _write_row_group(self) -> None:
+        rows, self._rows = self._rows, []
+        known = set(self.metric_names)
+        for prompt in rows:
+            self._dropped_metrics.update(
+                name
+                for name, value in prompt.metrics.items()
+                if isinstance(value, bool) and name not in known
+            )
+
+        columns = {
+            "category": [prompt.category.nome for prompt in rows],
+            "content": [prompt.content for prompt in rows],
+            "word_count": [prompt.metrics.get("word_count") for prompt in rows],
+            "score": [prompt.quality_score for prompt in rows],
+            "max_score": [prompt.max_quality_score for prompt in rows],
+        }
+        for name in self.metric_names:
+            columns[name] = [prompt.metrics.get(name) for prompt in rows]
+        table = self._pa.Table.from_pydict(columns, schema=self._schema)
+        self._writer.write_table(table, row_group_size=self.row_group_size)
+
+    def _build_schema(self):
+        pa = self._pa
+        return pa.schema(
+            [
+                ("category", pa.string()),
+                ("content", pa.string()),
+                ("word_count", pa.int32()),
+                ("score", pa.int32()),
+                ("max_score", pa.int32()),
+                *((name, pa.bool_()) for name in self.metric_names),
+            ]
+        )
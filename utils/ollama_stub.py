@@ -0,0 +1,139 @@
+"""Servidor HTTP mínimo que imita a API do Ollama.
+
+Serve ``/api/version`` e ``/api/chat`` (com e sem streaming) com uma resposta
+fixa, para testar o pool de hosts e medir o sistema sem GPU.
+
+Uso:
+    python -m utils.ollama_stub --port 11434 --delay 0.2
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Tuple
+
+DEFAULT_RESPONSE = (
+    "Elabore o comunicado para Maria Silva, CPF 123.456.789-09, matrícula 4521, "
+    "referente ao período de 10/10/2024, com valor de R$ 1.250,00 e próximos passos."
+)
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "OllamaStubServer"
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        if self.server.fail:
+            self._send_json({"error": "stub indisponível"}, status=500)
+        elif self.path == "/api/version":
+            self._send_json({"version": "stub"})
+        else:
+            self._send_json({"error": "not found"}, status=404)
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        self.server.requests += 1
+
+        if self.path != "/api/chat":
+            self._send_json({"error": "not found"}, status=404)
+            return
+        if self.server.fail:
+            self._send_json({"error": "stub indisponível"}, status=500)
+            return
+
+        time.sleep(self.server.delay)
+        model = request.get("model", "")
+        if request.get("stream"):
+            self._stream_chat(model)
+        else:
+            self._send_json(self._chat_chunk(model, self.server.response, done=True))
+
+    def _stream_chat(self, model: str) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for word in self.server.response.split(" "):
+                self._write_chunk(self._chat_chunk(model, word + " ", done=False))
+                time.sleep(self.server.token_delay)
+            self._write_chunk(self._chat_chunk(model, "", done=True))
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            self.server.aborted += 1
+
+    def _write_chunk(self, data: dict) -> None:
+        line = json.dumps(data).encode() + b"\n"
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(line), line))
+        self.wfile.flush()
+
+    @staticmethod
+    def _chat_chunk(model: str, content: str, done: bool) -> dict:
+        return {
+            "model": model,
+            "created_at": "2024-01-01T00:00:00Z",
+            "message": {"role": "assistant", "content": content},
+            "done": done,
+        }
+
+    def _send_json(self, data: dict, status: int = 200) -> None:
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class OllamaStubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: Tuple[str, int],
+        delay: float = 0.0,
+        response: str = DEFAULT_RESPONSE,
+        token_delay: float = 0.0,
+    ):
+        super().__init__(address, _StubHandler)
+        self.delay = delay
+        self.response = response
+        self.token_delay = token_delay
+        self.fail = False
+        self.requests = 0
+        self.aborted = 0
+
+    @property
+    def host(self) -> str:
+        return f"http://{self.server_address[0]}:{self.server_address[1]}"
+
+
+def start_stub_server(port: int = 0, **kwargs) -> OllamaStubServer:
+    """Inicia um stub em segundo plano (porta 0 = porta livre)"""
+    server = OllamaStubServer(("127.0.0.1", port), **kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stub local da API do Ollama")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--delay", type=float, default=0.0)
+    parser.add_argument("--token-delay", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = OllamaStubServer(
+        ("127.0.0.1", args.port), delay=args.delay, token_delay=args.token_delay
+    )
+    print(f"🧪 Stub do Ollama em {server.host}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
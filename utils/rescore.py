@@ -0,0 +1,110 @@
+"""Reavalia a qualidade de uma exportação JSONL existente.
+
+Uso:
+    python -m utils.rescore outputs/prompts_export.jsonl -o outputs/rescored.jsonl
+"""
+
+import argparse
+import contextlib
+import json
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from config.settings import AppConfig
+from services.category_loader import CategoryLoader
+from services.text_processor import QualityEvaluator
+
+
+def category_name(category: Any) -> Optional[str]:
+    """Nome da categoria: o JSONL traz o nome, a exportação JSON um objeto"""
+    if isinstance(category, dict):
+        return category.get("nome")
+    return category
+
+
+def rescore_file(
+    input_file: Path,
+    output_file: Path,
+    evaluator: QualityEvaluator,
+    default_category: Optional[str] = None,
+    max_workers: Optional[int] = None,
+    block_size: int = 50_000,
+) -> int:
+    """Reavalia cada registro e grava o resultado; retorna quantos foram gravados.
+
+    O arquivo é lido em blocos de ``block_size`` linhas, então o uso de memória
+    não depende do tamanho da exportação. Um único pool de processos atende
+    todos os blocos.
+    """
+    total = 0
+    with contextlib.ExitStack() as stack:
+        f_in = stack.enter_context(open(input_file, "r", encoding="utf-8"))
+        f_out = stack.enter_context(open(output_file, "w", encoding="utf-8"))
+        executor = (
+            stack.enter_context(evaluator.process_pool(max_workers))
+            if max_workers != 1
+            else None
+        )
+
+        while True:
+            records: List[Dict[str, Any]] = [
+                json.loads(line) for line in islice(f_in, block_size) if line.strip()
+            ]
+            if not records:
+                break
+
+            texts = [r.get("text", r.get("content", "")) for r in records]
+            categories = [
+                category_name(r.get("category")) or default_category for r in records
+            ]
+            results = evaluator.evaluate_many(
+                texts, categories, max_workers, executor=executor
+            )
+
+            for record, (metrics, score, max_score) in zip(records, results):
+                record["metrics"] = metrics
+                record["quality_score"] = score
+                record["max_quality_score"] = max_score
+                record["quality_percentage"] = (
+                    (score / max_score) * 100 if max_score else 0.0
+                )
+                f_out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            total += len(records)
+
+    return total
+
+
+def main():
+    defaults = AppConfig()
+    parser = argparse.ArgumentParser(
+        description="Reavalia a qualidade de uma exportação JSONL"
+    )
+    parser.add_argument("input", type=Path)
+    parser.add_argument("-o", "--output", type=Path, required=True)
+    parser.add_argument(
+        "--category",
+        default=None,
+        help="Categoria usada para registros sem o campo 'category'",
+    )
+    parser.add_argument("--examples-dir", type=Path, default=defaults.examples_dir)
+    parser.add_argument("--min-words", type=int, default=defaults.min_word_count)
+    parser.add_argument("--max-words", type=int, default=defaults.max_word_count)
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Processos (padrão: núcleos)"
+    )
+    args = parser.parse_args()
+
+    evaluator = QualityEvaluator(args.min_words, args.max_words)
+    evaluator.register_categories(
+        CategoryLoader(args.examples_dir).load_all_categories().values()
+    )
+
+    total = rescore_file(
+        args.input, args.output, evaluator, args.category, args.workers
+    )
+    print(f"✅ {total} prompts reavaliados em {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from models.job import PlannedJob
+
+
+class RunJournal:
+    """Diário de uma execução em lote, gravado ao lado da exportação.
+
+    A primeira linha guarda o plano (sequência de categorias e seeds); cada
+    linha seguinte registra um job concluído e o prompt_id gravado na
+    exportação. Isso permite retomar uma execução interrompida sem refazer o
+    trabalho já concluído.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        jobs: List[PlannedJob],
+        run_seed: Optional[int] = None,
+        completed: Optional[Dict[int, int]] = None,
+    ):
+        self.path = Path(path)
+        self.jobs = jobs
+        self.run_seed = run_seed
+        self.completed: Dict[int, int] = completed or {}
+        self._file = None
+
+    @staticmethod
+    def path_for(output_file: Path) -> Path:
+        output_file = Path(output_file)
+        return output_file.with_name(output_file.name + ".journal")
+
+    @classmethod
+    def create(
+        cls, path: Path, jobs: List[PlannedJob], run_seed: Optional[int] = None
+    ) -> "RunJournal":
+        """Cria um novo diário, sobrescrevendo um anterior"""
+        journal = cls(path, jobs, run_seed)
+        with open(journal.path, "w", encoding="utf-8") as f:
+            plan = {
+                "type": "plan",
+                "run_seed": run_seed,
+                "jobs": [[job.category, job.seed] for job in jobs],
+            }
+            f.write(json.dumps(plan, ensure_ascii=False) + "\n")
+        return journal
+
+    @classmethod
+    def load(cls, path: Path) -> "RunJournal":
+        """Lê um diário existente, descartando uma última linha incompleta.
+
+        O diário é truncado no fim da última linha válida, para que os
+        registros gravados ao retomar não fiquem colados ao fragmento.
+        """
+        jobs: List[PlannedJob] = []
+        run_seed = None
+        completed: Dict[int, int] = {}
+
+        valid_size = 0
+        with open(path, "rb+") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                valid_size += len(line)
+                if entry["type"] == "plan":
+                    run_seed = entry.get("run_seed")
+                    jobs = [
+                        PlannedJob(index, category, seed)
+                        for index, (category, seed) in enumerate(entry["jobs"])
+                    ]
+                elif entry["type"] == "done":
+                    completed[entry["job"]] = entry["prompt_id"]
+            f.truncate(valid_size)
+
+        return cls(path, jobs, run_seed, completed)
+
+    @property
+    def completed_jobs(self) -> Set[int]:
+        return set(self.completed)
+
+    def pending_jobs(self) -> List[PlannedJob]:
+        return [job for job in self.jobs if job.index not in self.completed]
+
+    def mark_done(self, job_index: int, prompt_id: int) -> None:
+        """Registra um job concluído e envia a linha ao disco"""
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        entry = {"type": "done", "job": job_index, "prompt_id": prompt_id}
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+        self.completed[job_index] = prompt_id
+
+    def truncate_export(self, output_file: Path) -> int:
+        """Remove da exportação as linhas que o diário não registrou.
+
+        Uma interrupção entre gravar o prompt e registrá-lo no diário deixaria
+        uma linha que seria gerada de novo ao retomar. Retorna quantas linhas
+        foram removidas.
+        """
+        output_file = Path(output_file)
+        if not output_file.exists():
+            return 0
+
+        keep = max(self.completed.values(), default=0)
+        removed = 0
+        offset = 0
+        with open(output_file, "rb+") as f:
+            for line_number, line in enumerate(f, 1):
+                if line_number <= keep and line.endswith(b"\n"):
+                    offset += len(line)
+                else:
+                    removed += 1
+            f.truncate(offset)
+        return removed
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "RunJournal":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,35 @@
+import re
+
+# Palavras, números e sinais de pontuação isolados
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+# Média aproximada de caracteres por token em palavras longas (BPE)
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimativa local e barata do número de tokens de um texto.
+
+    Cada sinal de pontuação conta como um token e cada palavra como
+    ``ceil(len / CHARS_PER_TOKEN)``, o que se aproxima dos tokenizadores BPE
+    usados pelos modelos do Ollama sem precisar carregá-los.
+    """
+    return sum(
+        -(-len(piece) // CHARS_PER_TOKEN) for piece in TOKEN_PATTERN.findall(text)
+    )
+
+
+def truncate_to_tokens(text: str, max_tokens: int, marker: str = " [...]") -> str:
+    """Corta o texto em limite de palavra para caber em ``max_tokens``"""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    budget = max_tokens - estimate_tokens(marker)
+    used = 0
+    end = 0
+    for match in re.finditer(r"\S+", text):
+        cost = estimate_tokens(match.group())
+        if used + cost > budget:
+            break
+        used += cost
+        end = match.end()
+    return text[:end] + marker